@@ -0,0 +1,174 @@
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from models.curves.yield_curve import YieldCurve
+
+DEFAULT_ROOT = Path(os.environ.get("CURVE_STORE_DIR", "/mnt/artifacts/curve_store"))
+
+
+class CurveStore:
+    """
+    Local date × tenor rate matrix for one curve_type, persisted as .npy
+    files and read back memory-mapped.
+
+    Layout under <root>/<curve_type slug>/:
+      • tenors.npy  (K,)    float64 tenor grid (years)
+      • dates.npy   (D,)    datetime64[D], sorted ascending
+      • rates.npy   (D, K)  float64 rates in percent, NaN where missing
+
+    Readers open the files with mmap_mode='r', so every job and worker
+    process on the host shares the same pages with zero copies.  The store
+    is append-only: sync() writes new files next to the old ones and swaps
+    them in with os.replace (rates first, then dates), and readers use the
+    common prefix of the two, so a reader never sees a torn row.
+    """
+
+    def __init__(self, curve_type="US Treasury Par", root=DEFAULT_ROOT):
+        self.curve_type = curve_type
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", curve_type).strip("_").lower()
+        self.path = Path(root) / slug
+        self._dates = self._rates = self._tenors = None
+
+    # ── reading ──────────────────────────────────────────────────────────
+    def _file(self, name):
+        return self.path / f"{name}.npy"
+
+    def exists(self):
+        return self._file("dates").exists()
+
+    def reload(self):
+        """(Re)open the memory-mapped arrays, e.g. after another process synced."""
+        if not self.exists():
+            self._dates = np.array([], dtype="datetime64[D]")
+            self._tenors = np.array([], dtype=float)
+            self._rates = np.empty((0, 0), dtype=float)
+            return self
+        rates = np.load(self._file("rates"), mmap_mode="r")
+        dates = np.load(self._file("dates"), mmap_mode="r")
+        n = min(len(dates), len(rates))
+        self._tenors = np.load(self._file("tenors"))
+        self._dates, self._rates = dates[:n], rates[:n]
+        return self
+
+    @property
+    def dates(self):
+        if self._dates is None:
+            self.reload()
+        return self._dates
+
+    @property
+    def tenors(self):
+        if self._tenors is None:
+            self.reload()
+        return self._tenors
+
+    @property
+    def rates(self):
+        if self._rates is None:
+            self.reload()
+        return self._rates
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def last_date(self):
+        return pd.Timestamp(self.dates[-1]) if len(self) else None
+
+    def window(self, start_date, end_date):
+        """
+        (dates, rates) for curve_date in [start_date, end_date] as read-only
+        views into the memory map (no copy).
+        """
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date).date(), "D"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date).date(), "D"), side="right")
+        return self.dates[lo:hi], self.rates[lo:hi]
+
+    def frame(self, start_date=None, end_date=None):
+        """Window as a curve_date × tenor_num DataFrame (copies the data)."""
+        start = self.dates[0] if start_date is None else start_date
+        end = self.dates[-1] if end_date is None else end_date
+        dates, rates = self.window(start, end)
+        return pd.DataFrame(np.array(rates), index=pd.DatetimeIndex(dates, name="curve_date"),
+                            columns=pd.Index(self.tenors, name="tenor_num"))
+
+    def curve(self, as_of_date, method="linear"):
+        """YieldCurve for one curve_date (tenors with missing rates are dropped)."""
+        i = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(as_of_date).date(), "D"))
+        if i == len(self) or self.dates[i] != np.datetime64(pd.Timestamp(as_of_date).date(), "D"):
+            raise ValueError(f"No yield curve data found for {pd.Timestamp(as_of_date).date()}")
+        row = np.asarray(self.rates[i])
+        ok = ~np.isnan(row)
+        return YieldCurve(self.tenors[ok], row[ok], method=method)
+
+    # ── writing ──────────────────────────────────────────────────────────
+    def _save(self, name, arr):
+        tmp = self.path / f".{name}.{os.getpid()}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, self._file(name))
+
+    def append(self, dates, tenors, rates):
+        """
+        Append rows for dates after last_date.  `rates` is (len(dates) × len(tenors));
+        columns are aligned to the stored tenor grid (new tenors are ignored once
+        the grid is set, missing ones become NaN).
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        tenors = np.asarray(tenors, dtype=float)
+        rates = np.asarray(rates, dtype=float)
+
+        self.reload()
+        if len(self):
+            keep = dates > self.dates[-1]
+            dates, rates = dates[keep], rates[keep]
+        if len(dates) == 0:
+            return 0
+
+        order = np.argsort(dates)
+        dates, rates = dates[order], rates[order]
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        if len(self.tenors) == 0:
+            grid = np.sort(tenors)
+            self._save("tenors", grid)
+        else:
+            grid = self.tenors
+        aligned = pd.DataFrame(rates, columns=tenors).reindex(columns=grid).to_numpy()
+
+        self._save("rates", np.concatenate([np.asarray(self.rates).reshape(-1, len(grid)), aligned]))
+        self._save("dates", np.concatenate([np.asarray(self.dates), dates]))
+        self.reload()
+        return len(dates)
+
+    def sync(self, data_source, start_date=None):
+        """
+        Pull curve_dates newer than the stored ones from rate_curves and append
+        them.  Returns the number of dates added.
+        """
+        last = self.last_date
+        if last is not None:
+            cond = f"AND curve_date > '{last.date()}'"
+        elif start_date is not None:
+            cond = f"AND curve_date >= '{pd.Timestamp(start_date).date()}'"
+        else:
+            cond = ""
+
+        sql = f"""
+        SELECT curve_date, tenor_num, rate
+          FROM rate_curves
+         WHERE curve_type = '{self.curve_type}'
+           {cond}
+           AND rate IS NOT NULL
+         ORDER BY curve_date, tenor_num;
+        """
+        df = data_source.query(sql).to_pandas()
+        if df.empty:
+            return 0
+
+        pivot = df.pivot_table(index="curve_date", columns="tenor_num", values="rate", aggfunc="last")
+        return self.append(pd.to_datetime(pivot.index).to_numpy(), pivot.columns.to_numpy(dtype=float),
+                           pivot.to_numpy(dtype=float))
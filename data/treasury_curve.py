@@ -1,9 +1,16 @@
-from scipy.interpolate import interp1d
+from models.curves.yield_curve import YieldCurve
 
-def get_yield_curve(as_of_date, data_source):
+def get_yield_curve(as_of_date, data_source, store=None, method="linear"):
     """
-    Query the rate_curves table and return a linear interpolator of tenor_num → rate.
+    Query the rate_curves table and return a YieldCurve of tenor_num → rate
+    (linear extrapolation; `method` is "linear", "cubic" or "monotone_convex").
+
+    With a synced CurveStore the curve is read from the local memory map
+    instead of issuing one query per date.
     """
+    if store is not None:
+        return store.curve(as_of_date, method=method)
+
     query = f"""
     SELECT tenor_num, rate
     FROM rate_curves
@@ -17,10 +24,12 @@ def get_yield_curve(as_of_date, data_source):
     if df.empty:
         raise ValueError(f"No yield curve data found for {as_of_date.date()}")
 
-    # Create interpolator (you can switch to kind='cubic' if needed)
-    return interp1d(df["tenor_num"], df["rate"], kind="linear", fill_value="extrapolate")
+    return YieldCurve(df["tenor_num"].to_numpy(), df["rate"].to_numpy(), method=method)
 
 def bump_curve(base_yc, shift_bp):
+    if isinstance(base_yc, YieldCurve):
+        return base_yc.parallel(shift_bp)
+
     def f(t_arr):
         return base_yc(t_arr) + (shift_bp / 100.0)
     return f
@@ -0,0 +1,137 @@
+import numpy as np
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+from sklearn.base import BaseEstimator
+
+from models.covariance.garch import fit_garch11, garch_variance_filter
+
+
+def _lagged_outer(z, q_bar):
+    """(T, N, N) stack of z_{t-1} z_{t-1}', with Q̄ standing in for t = 0."""
+    outer = z[:, :, np.newaxis] * z[:, np.newaxis, :]
+    return np.concatenate([q_bar[np.newaxis], outer[:-1]])
+
+
+def _dcc_filter(lagged, a, b, q_bar):
+    """Q_t for all t as one first-order lfilter over the lagged outer products."""
+    u = a * lagged
+    u += (1 - a - b) * q_bar
+    return lfilter([1.0], [1.0, -b], u, axis=0, zi=b * q_bar[np.newaxis])[0]
+
+
+def dcc_recursion(z, a, b, q_bar):
+    """
+    DCC(1,1) quasi-correlations for all t at once:
+      Q_t = (1-a-b)⋅Q̄ + a⋅z_{t-1} z_{t-1}' + b⋅Q_{t-1},   Q_0 = Q̄
+
+    Returns:
+      Q (T, N, N), R (T, N, N) with R_t = diag(Q_t)^-½ ⋅ Q_t ⋅ diag(Q_t)^-½
+    """
+    z = np.asarray(z, dtype=float)
+    Q = _dcc_filter(_lagged_outer(z, q_bar), a, b, q_bar)
+    d = 1.0 / np.sqrt(np.einsum("tii->ti", Q))
+    R = Q * d[:, :, np.newaxis] * d[:, np.newaxis, :]
+    return Q, R
+
+
+def _dcc_nll(theta, z, lagged, q_bar):
+    """
+    Correlation part of the Gaussian DCC negative log-likelihood, per
+    observation, evaluated for all t with batched slogdet / solve on Q_t:
+      log|R_t| = log|Q_t| − Σ log q_ii,t
+      z_t'R_t⁻¹z_t = z̃_t'Q_t⁻¹z̃_t,   z̃_t = z_t ⋅ √diag(Q_t)
+    """
+    a, b = theta
+    Q = _dcc_filter(lagged, a, b, q_bar)
+    q = np.einsum("tii->ti", Q)
+    zt = z * np.sqrt(q)
+    _, logdet = np.linalg.slogdet(Q)
+    quad = np.einsum("ti,ti->t", zt, np.linalg.solve(Q, zt[:, :, np.newaxis])[:, :, 0])
+    return 0.5 * np.mean(logdet - np.log(q).sum(axis=1) + quad)
+
+
+class DCCCovarianceModel(BaseEstimator):
+    """
+    Dynamic conditional correlation, DCC(1,1) (Engle 2002):
+
+      - Fits a GARCH(1,1) to each column of X with the native joint
+        estimator (fit_garch11) → conditional vols D_t and residuals z_t.
+      - Q_t = (1-a-b)⋅Q̄ + a⋅z_{t-1}z_{t-1}' + b⋅Q_{t-1}, Q̄ = sample second
+        moment of z; R_t is Q_t rescaled to unit diagonal.
+      - (a, b) maximize the correlation likelihood, evaluated for all t with
+        batched slogdet / solve.
+      - Covariance at final time: D_t · R_t · D_t.
+    """
+    name = "DCC(1,1)"
+
+    def __init__(self):
+        self._cov = None
+        self._params = None
+        self._dcc = None
+        self._q_bar = None
+        self._cond_vol = None
+        self._corr_path = None
+
+    def fit(self, X, y=None):
+        """
+        X : array-like, shape (n_obs, n_series)
+        """
+        X = np.asarray(X, dtype=float)
+        n_obs, n_ser = X.shape
+
+        # 1) univariate GARCH(1,1) for every tenor in one optimizer call
+        params, cond_vol, z = fit_garch11(X)
+
+        # 2) DCC parameters on the standardized residuals
+        q_bar = z.T @ z / n_obs
+        res = minimize(_dcc_nll, x0=[0.02, 0.95], args=(z, _lagged_outer(z, q_bar), q_bar),
+                       method="SLSQP",
+                       bounds=[(0.0, 1.0), (0.0, 1.0)],
+                       constraints=[{"type": "ineq", "fun": lambda th: 0.999 - th[0] - th[1]}])
+        a, b = res.x
+
+        # 3) conditional correlations and covariance at the last time point
+        _, R = dcc_recursion(z, a, b, q_bar)
+        D = np.diag(cond_vol[-1])
+        self._cov = D @ R[-1] @ D
+
+        self._params, self._dcc, self._q_bar = params, (a, b), q_bar
+        self._cond_vol, self._corr_path = cond_vol, R
+        return self
+
+    def predict(self, X):
+        """
+        Returns the same covariance matrix for each sample in X, as a
+        read-only (m, N, N) broadcast view.
+        """
+        m = np.asarray(X).shape[0]
+        return np.broadcast_to(self._cov, (m,) + self._cov.shape)
+
+    def predict_path(self, X):
+        """
+        Conditional covariances D_t · R_t · D_t, shape (T, N, N), for the rows
+        of X, filtered with the fitted GARCH and DCC parameters.
+        """
+        X = np.asarray(X, dtype=float)
+        sigma2 = garch_variance_filter(X, self._params[:, 0], self._params[:, 1], self._params[:, 2])
+        cond_vol = np.sqrt(sigma2)
+        _, R = dcc_recursion(X / cond_vol, *self._dcc, self._q_bar)
+        return cond_vol[:, :, np.newaxis] * R * cond_vol[:, np.newaxis, :]
+
+    @property
+    def covariance_(self):
+        """Latest estimated covariance matrix."""
+        return self._cov
+
+    @property
+    def covariance_path_(self):
+        """D_t · R_t · D_t at every fit observation, shape (n_obs, N, N)."""
+        if self._cond_vol is None:
+            return None
+        v = self._cond_vol
+        return v[:, :, np.newaxis] * self._corr_path * v[:, np.newaxis, :]
+
+    @property
+    def dcc_params_(self):
+        """Fitted (a, b)."""
+        return self._dcc
@@ -8,17 +8,31 @@ class EmpiricalCovarianceModel(BaseEstimator):
 
     def __init__(self):
         self._cov = None
+        self._n_obs = 0
 
     def fit(self, X, y=None):
         from sklearn.covariance import EmpiricalCovariance as _EC
         ec = _EC().fit(X)
         self._cov = ec.covariance_
+        self._n_obs = np.shape(X)[0]
         return self
 
     def predict(self, X):
-        m, n = X.shape
-        return np.repeat(self._cov[np.newaxis, :, :], repeats=m, axis=0)
+        """Read-only (m, N, N) view of the fitted covariance, one per sample (no copies)."""
+        m = X.shape[0]
+        return np.broadcast_to(self._cov, (m,) + self._cov.shape)
+
+    def predict_path(self, X):
+        """The static covariance is its own conditional path."""
+        return self.predict(X)
 
     @property
     def covariance_(self):
-        return self._cov
\ No newline at end of file
+        return self._cov
+
+    @property
+    def covariance_path_(self):
+        """Covariance at each fit observation: a broadcast view of covariance_."""
+        if self._cov is None:
+            return None
+        return np.broadcast_to(self._cov, (self._n_obs,) + self._cov.shape)
@@ -1,11 +1,20 @@
 import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
 from sklearn.base import BaseEstimator
 
+from models.covariance.ewma_driftless import _state_date, ewma_weights, last_index_date
+
 class EWMADriftCovarianceModel(BaseEstimator):
     """
     Exponentially-Weighted Covariance with drift:
       μ_t    = λ·μ_{t-1} + (1-λ)·r_t
       cov_t = λ·cov_{t-1} + (1-λ)·( (r_t - μ_t)(r_t - μ_t)' )
+
+    fit() starts both recursions from zero; partial_fit()/update() advance
+    the fitted state (cov, drift) by new observations.  As in
+    EWMACovarianceModel, the conditional path is available only as
+    predict_path(X).
     """
     name = "ewmaDrift"
 
@@ -13,33 +22,94 @@ class EWMADriftCovarianceModel(BaseEstimator):
         self.decay = decay
         self._cov = None
         self._drift = None
+        self.last_date_ = None
 
     def fit(self, X, y=None):
         """
         X: array of shape (T, N), rows = return vectors across N tenors
         """
+        self._cov = self._drift = None
+        self.partial_fit(X)
+        return self
+
+    def partial_fit(self, X, y=None, date=None):
+        """
+        Advance both recursions by the rows of X (T × N), continuing from
+        the current drift and covariance (zero if not fitted).
+        """
         lam = self.decay
+        last = last_index_date(X, date)
+        X = np.atleast_2d(np.asarray(X, dtype=float))
         T, N = X.shape
+        if T == 0:
+            if self._cov is None:
+                self._cov, self._drift = np.zeros((N, N)), np.zeros(N)
+            return self
 
-        cov   = np.zeros((N, N), dtype=float)
-        drift = np.zeros(N,      dtype=float)
+        # μ_t for every t: the drift recursion is a first-order IIR filter,
+        # seeded with λ·μ_{t-1} from the current state
+        zi = None if self._drift is None else lam * self._drift[np.newaxis, :]
+        if zi is None:
+            drifts = lfilter([1 - lam], [1, -lam], X, axis=0)
+        else:
+            drifts, _ = lfilter([1 - lam], [1, -lam], X, axis=0, zi=zi)
+        delta = X - drifts
 
-        for t in range(T):
-            r = X[t]                               # shape (N,)
-            drift = lam * drift + (1 - lam) * r    # update mean
-            delta = r - drift
-            cov   = lam * cov   + (1 - lam) * np.outer(delta, delta)
+        w = ewma_weights(lam, T)
+        cov = (delta * w[:, np.newaxis]).T @ delta
+        if self._cov is not None:
+            cov += lam ** T * self._cov
 
         self._cov   = cov
-        self._drift = drift
+        self._drift = drifts[-1].copy()
+        if last is not None:
+            self.last_date_ = last
         return self
 
+    def update(self, r_t, date=None):
+        """One-step update with a single return vector r_t (N,): O(N²)."""
+        return self.partial_fit(np.asarray(r_t, dtype=float)[np.newaxis, :], date=date)
+
+    def get_state(self):
+        """JSON-serializable fitted state."""
+        return {
+            "decay": self.decay,
+            "cov": None if self._cov is None else self._cov.tolist(),
+            "drift": None if self._drift is None else self._drift.tolist(),
+            "last_date": _state_date(self.last_date_),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a fitted model from get_state() output."""
+        model = cls(decay=state["decay"])
+        if state.get("cov") is not None:
+            model._cov = np.asarray(state["cov"], dtype=float)
+        if state.get("drift") is not None:
+            model._drift = np.asarray(state["drift"], dtype=float)
+        if state.get("last_date") is not None:
+            model.last_date_ = pd.Timestamp(state["last_date"])
+        return model
+
     def predict(self, X):
         """
         Return cov for each sample so this plays nicely in pipelines/MLflow.
         """
         m = X.shape[0]
-        return np.repeat(self._cov[np.newaxis, :, :], repeats=m, axis=0)
+        return np.broadcast_to(self._cov, (m,) + self._cov.shape)
+
+    def predict_path(self, X):
+        """
+        Conditional covariance after each row of X, shape (T, N, N), with both
+        recursions started from zero as in fit(); the last entry equals
+        fit(X).covariance_.  One lfilter over the stacked outer products of
+        the de-drifted returns.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        lam = self.decay
+        delta = X - lfilter([1 - lam], [1, -lam], X, axis=0)
+        outer = delta[:, :, np.newaxis] * delta[:, np.newaxis, :]
+        return lfilter([1 - lam], [1, -lam], outer, axis=0)
 
     @property
     def covariance_(self):
@@ -1,27 +1,97 @@
 import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
 from sklearn.base import BaseEstimator
 
+def ewma_weights(decay, T):
+    """
+    Weights of each observation in the EWMA recursion started from zero:
+      w_t = (1-λ)⋅λ^(T-1-t),  t = 0..T-1
+    so that cov_T = Σ_t w_t⋅x_t x_t' = Xᵀ⋅diag(w)⋅X.
+    """
+    return (1 - decay) * decay ** np.arange(T - 1, -1, -1, dtype=float)
+
+
+def last_index_date(X, date=None):
+    """Explicit date, else the last label of a DatetimeIndex'd frame, else None."""
+    if date is not None:
+        return pd.Timestamp(date)
+    index = getattr(X, "index", None)
+    if isinstance(index, pd.DatetimeIndex) and len(index):
+        return index[-1]
+    return None
+
+
+def _state_date(ts):
+    return None if ts is None else pd.Timestamp(ts).isoformat()
+
+
 class EWMACovarianceModel(BaseEstimator):
     """
     Exponentially-Weighted Covariance:
       cov_t = λ⋅cov_{t-1} + (1-λ)⋅(Δr_t Δr_t')
+
+    fit() starts the recursion from zero; partial_fit()/update() advance the
+    fitted state by new observations, so a daily job can carry yesterday's
+    state (get_state/from_state) instead of refitting the whole window.
+
+    The conditional path is available only as predict_path(X): the model
+    keeps just the latest covariance, not its training data, so pickled
+    models stay O(N²).
     """
     name = "ewmaDriftless"
 
     def __init__(self, decay: float = 0.94):
         self.decay = decay
         self._cov = None
+        self.last_date_ = None
 
     def fit(self, X, y=None):
+        self._cov = None
+        self.partial_fit(X)
+        return self
+
+    def partial_fit(self, X, y=None, date=None):
+        """
+        Advance the recursion by the rows of X (T × N):
+          cov ← λ^T⋅cov + Xᵀ⋅diag(w)⋅X
+        """
         lam = self.decay
+        last = last_index_date(X, date)
+        X = np.atleast_2d(np.asarray(X, dtype=float))
         T, N = X.shape
-        cov = np.zeros((N, N), dtype=float)
-        for t in range(T):
-            x = X[t].reshape(-1, 1)
-            cov = lam * cov + (1 - lam) * (x @ x.T)
+
+        w = ewma_weights(lam, T)
+        cov = (X * w[:, np.newaxis]).T @ X
+        if self._cov is not None:
+            cov += lam ** T * self._cov
         self._cov = cov
+        if last is not None:
+            self.last_date_ = last
         return self
 
+    def update(self, r_t, date=None):
+        """One-step update with a single return vector r_t (N,): O(N²)."""
+        return self.partial_fit(np.asarray(r_t, dtype=float)[np.newaxis, :], date=date)
+
+    def get_state(self):
+        """JSON-serializable fitted state."""
+        return {
+            "decay": self.decay,
+            "cov": None if self._cov is None else self._cov.tolist(),
+            "last_date": _state_date(self.last_date_),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a fitted model from get_state() output."""
+        model = cls(decay=state["decay"])
+        if state.get("cov") is not None:
+            model._cov = np.asarray(state["cov"], dtype=float)
+        if state.get("last_date") is not None:
+            model.last_date_ = pd.Timestamp(state["last_date"])
+        return model
+
     def predict(self, X):
         """
         Return the same covariance matrix for each sample in X.
@@ -29,8 +99,19 @@ class EWMACovarianceModel(BaseEstimator):
         log it properly.
         """
         m = X.shape[0]
-        # shape (m, N, N)
-        return np.repeat(self._cov[np.newaxis, :, :], repeats=m, axis=0)
+        # shape (m, N, N), read-only broadcast view
+        return np.broadcast_to(self._cov, (m,) + self._cov.shape)
+
+    def predict_path(self, X):
+        """
+        Conditional covariance after each row of X, shape (T, N, N), with the
+        recursion started from zero as in fit(); the last entry equals
+        fit(X).covariance_.  One lfilter over the stacked outer products.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        lam = self.decay
+        outer = X[:, :, np.newaxis] * X[:, np.newaxis, :]
+        return lfilter([1 - lam], [1, -lam], outer, axis=0)
 
     @property
     def covariance_(self):
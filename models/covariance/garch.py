@@ -1,7 +1,247 @@
+import atexit
+import hashlib
+import os
+import threading
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy.signal import lfilter
 from sklearn.base import BaseEstimator
 from arch.univariate import arch_model
 
+# (tenor, p, q) → {"fits":   {(engine, (window_start, window_end, n_obs), digest): (ω, α…, β…)},
+#                   "ends":   sorted window ends,
+#                   "by_end": {window_end: latest params fitted for that end}}
+# shared by every model in the process; _lock guards it and _pools, since
+# the cone jobs call fit() from many threads at once
+_param_cache = {}
+_pools = {}
+_lock = threading.Lock()
+
+
+def garch_backcast(resid):
+    """
+    Pre-sample variance per series, as arch's GARCH backcast: an EWMA
+    (0.94) average of the first min(75, T) squared residuals.
+    """
+    resid = np.asarray(resid, dtype=float)
+    tau = min(75, len(resid))
+    w = 0.94 ** np.arange(tau)
+    w /= w.sum()
+    return w @ resid[:tau] ** 2
+
+
+def garch_variance_filter(resid, omega, alpha, beta, backcast=None):
+    """
+    GARCH(p,q) conditional variances of all series at once:
+      σ²_t = ω + Σᵢ αᵢ⋅ε²_{t-i} + Σⱼ βⱼ⋅σ²_{t-j}
+    with pre-sample ε² and σ² set to the backcast.  The loop runs over time
+    only; each step updates the whole (N,) vector of series.
+
+    Args:
+      resid : (T, N) residuals
+      omega : (N,);  alpha : (N, p);  beta : (N, q)
+      backcast : (N,) pre-sample variance (default: garch_backcast(resid))
+
+    Returns:
+      sigma2 (T, N)
+    """
+    resid = np.asarray(resid, dtype=float)
+    omega = np.asarray(omega, dtype=float)
+    alpha = np.asarray(alpha, dtype=float).reshape(len(omega), -1)
+    beta = np.asarray(beta, dtype=float).reshape(len(omega), -1)
+    backcast = garch_backcast(resid) if backcast is None else np.asarray(backcast, dtype=float)
+
+    T, N = resid.shape
+    p, q = alpha.shape[1], beta.shape[1]
+    lag = max(p, q)
+    eps2 = np.vstack([np.broadcast_to(backcast, (lag, N)), resid ** 2])
+    sigma2 = np.vstack([np.broadcast_to(backcast, (lag, N)), np.empty((T, N))])
+
+    for t in range(lag, lag + T):
+        s = omega.copy()
+        for i in range(p):
+            s += alpha[:, i] * eps2[t - 1 - i]
+        for j in range(q):
+            s += beta[:, j] * sigma2[t - 1 - j]
+        sigma2[t] = s
+    return sigma2[lag:]
+
+
+def clear_param_cache():
+    """Drop all cached per-tenor GARCH parameters."""
+    with _lock:
+        _param_cache.clear()
+
+
+def _digest(x):
+    """Fingerprint of one series' values, so an exact hit means the same data."""
+    return hashlib.blake2b(np.ascontiguousarray(x).tobytes(), digest_size=16).digest()
+
+
+def _cached_params(tenor, engine, window, digest, p, q):
+    """
+    (exact hit for engine, window = (start, end, n_obs) and data digest,
+    warm start) for one tenor.  The warm start is the latest fit whose
+    window ends strictly before this one's end, of any length and from
+    either engine; found by bisection on the sorted ends.
+    """
+    with _lock:
+        entry = _param_cache.get((tenor, p, q))
+        if entry is None:
+            return None, None
+        hit = entry["fits"].get((engine, window, digest))
+        if window is None:
+            return hit, None
+        k = bisect_left(entry["ends"], window[1])
+        return hit, (entry["by_end"][entry["ends"][k - 1]] if k else None)
+
+
+def _store_params(tenor, engine, window, digest, p, q, params):
+    with _lock:
+        entry = _param_cache.setdefault((tenor, p, q), {"fits": {}, "ends": [], "by_end": {}})
+        entry["fits"][(engine, window, digest)] = params
+        if window is None:
+            return
+        end = window[1]
+        new = end not in entry["by_end"]
+        entry["by_end"][end] = params
+        if new:
+            insort(entry["ends"], end)
+
+
+def _fit_series(args):
+    """
+    Fit one zero-mean GARCH(p,q) series; returns its parameter vector in the
+    units of x.
+
+    The series is scaled to unit variance for the optimizer: rate deltas
+    have variances around 1e-4, where arch's optimizer stops at its own
+    starting values.  Only ω carries units (ω_x = ω_z ⋅ s²).
+    """
+    x, p, q, starting_values = args
+    scale = x.std() or 1.0
+    if starting_values is not None:
+        starting_values = np.array(starting_values, dtype=float)
+        starting_values[0] /= scale ** 2
+    g = arch_model(x / scale, mean="zero", vol="GARCH", p=p, q=q, dist="normal")
+    params = g.fit(disp="off", starting_values=starting_values).params.to_numpy().copy()
+    params[0] *= scale ** 2
+    return params
+
+
+def _pool(n_jobs):
+    with _lock:
+        if n_jobs not in _pools:
+            _pools[n_jobs] = ProcessPoolExecutor(max_workers=n_jobs)
+        return _pools[n_jobs]
+
+
+def shutdown_pools(wait=True):
+    """Shut down the shared fitting pools; the next n_jobs > 1 fit starts new ones."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+atexit.register(shutdown_pools)
+
+
+def _garch11_nll(theta, e2, backcast):
+    """
+    Gaussian negative log-likelihood of N zero-mean GARCH(1,1) series and
+    its analytic gradient, for stacked parameters θ = (ω, α, β) × N.
+
+    For a fixed β the variance recursion is a first-order linear filter, so
+    σ² and its derivatives ∂σ²/∂(ω, α, β) run over the whole (T × N) block
+    as one lfilter per series (pre-sample ε² and σ² at the backcast, as arch):
+      σ²_t      = ω + α⋅ε²_{t-1} + β⋅σ²_{t-1}
+      ∂σ²_t/∂θ  = (1, ε²_{t-1}, σ²_{t-1}) + β⋅∂σ²_{t-1}/∂θ
+
+    Returns:
+      (Σ nll / T, gradient (3N,))
+    """
+    T, N = e2.shape
+    omega, alpha, beta = theta.reshape(N, 3).T
+    e2_lag = np.vstack([backcast, e2[:-1]])                     # ε²_{t-1}
+    u = omega + alpha * e2_lag
+
+    sigma2 = np.empty((T, N))
+    for i in range(N):
+        sigma2[:, i] = lfilter([1.0], [1.0, -beta[i]], u[:, i], zi=[beta[i] * backcast[i]])[0]
+
+    s2_lag = np.vstack([backcast, sigma2[:-1]])
+    du = np.stack([np.ones((T, N)), e2_lag, s2_lag])            # (3, T, N)
+    d = np.empty_like(du)
+    for i in range(N):
+        d[:, :, i] = lfilter([1.0], [1.0, -beta[i]], du[:, :, i], axis=1)
+
+    w = 0.5 * (1.0 / sigma2 - e2 / sigma2 ** 2)
+    grad = np.einsum("tn,ktn->nk", w, d)
+
+    nll = 0.5 * np.sum(np.log(2 * np.pi) + np.log(sigma2) + e2 / sigma2)
+    return nll / T, grad.ravel() / T
+
+
+def fit_garch11(X, starting_values=None):
+    """
+    Native joint GARCH(1,1) fit of every column of X (zero mean, normal).
+
+    All N series are optimized in one SLSQP call over the stacked 3N
+    parameters with analytic gradients (the likelihood is separable, so
+    this is N independent fits sharing one optimizer loop).  Each series is
+    scaled to unit variance first and ω mapped back afterwards.
+
+    Args:
+      X               : (T, N) residuals
+      starting_values : optional (N, 3) (ω, α, β) in X's units; rows with
+                        NaN use the default start (α = 0.05, β = 0.90)
+
+    Returns:
+      params (N, 3), cond_vol (T, N), std_resid (T, N)
+    """
+    X = np.asarray(X, dtype=float)
+    T, N = X.shape
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = X / scale
+    e2 = Z ** 2
+    backcast = garch_backcast(Z)
+
+    x0 = np.tile([0.05, 0.05, 0.90], (N, 1))
+    if starting_values is not None:
+        sv = np.array(starting_values, dtype=float).reshape(N, 3)
+        sv[:, 0] /= scale ** 2
+        ok = ~np.isnan(sv).any(axis=1)
+        x0[ok] = sv[ok]
+    x0[:, 1:] = np.clip(x0[:, 1:], 1e-6, 1.0)
+    x0[:, 0] = np.clip(x0[:, 0], 1e-6, 10.0)
+    over = x0[:, 1] + x0[:, 2] > 0.9999
+    x0[over, 1:] *= 0.9999 / (x0[over, 1] + x0[over, 2])[:, np.newaxis]
+
+    # α_i + β_i ≤ 1 for every series
+    A = np.zeros((N, 3 * N))
+    A[np.arange(N), 3 * np.arange(N) + 1] = -1.0
+    A[np.arange(N), 3 * np.arange(N) + 2] = -1.0
+    constraint = {"type": "ineq", "fun": lambda th: 1.0 + A @ th, "jac": lambda th: A}
+    bounds = [(1e-8, 10.0), (0.0, 1.0), (0.0, 1.0)] * N
+
+    res = minimize(_garch11_nll, x0.ravel(), args=(e2, backcast), jac=True, method="SLSQP",
+                   bounds=bounds, constraints=[constraint],
+                   options={"maxiter": 500, "ftol": 1e-10})
+
+    params = res.x.reshape(N, 3).copy()
+    params[:, 0] *= scale ** 2
+    sigma2 = garch_variance_filter(X, params[:, 0], params[:, 1], params[:, 2])
+    cond_vol = np.sqrt(sigma2)
+    return params, cond_vol, X / cond_vol
+
+
 class GARCHCovarianceModel(BaseEstimator):
     """
     Multivariate covariance via univariate GARCH(1,1) + static correlation.
@@ -9,32 +249,85 @@ class GARCHCovarianceModel(BaseEstimator):
     - Fits a GARCH(1,1) to each column of X.
     - Computes standardized residuals, then sample correlation.
     - Builds covariance at final time: D_t · R · D_t, with D_t = diag(sigma_t).
+
+    covariance_path_ holds D_t · R · D_t at every fit observation;
+    predict_path(X) filters new data with the fitted GARCH parameters.
+
+    Fitted parameters are cached per (engine, tenor column, window, digest
+    of the column values), so a repeated fit of identical data reuses them
+    without refitting.  The window is (start, end, n_obs) of a DatetimeIndex
+    and columns are the frame's labels; a bare ndarray is keyed by column
+    position with no window.  Only dated frames get warm starts: with
+    warm_start a new window starts the optimizer from the fit (of either
+    engine) with the latest end strictly before its own for that tenor.  n_jobs > 1 fits the tenors on a shared
+    process pool (None → os.cpu_count()), kept until shutdown_pools().
+
+    engine:
+      "arch"   → one arch_model fit per tenor
+      "native" → fit_garch11: all tenors in one vectorized optimizer call
+                 (GARCH(1,1) only; n_jobs is not used)
     """
     name = "GARCH(1,1)"
 
-    def __init__(self, p: int = 1, q: int = 1):
+    def __init__(self, p: int = 1, q: int = 1, n_jobs: int = 1, warm_start: bool = True,
+                 engine: str = "arch"):
         self.p = p
         self.q = q
+        self.n_jobs = n_jobs
+        self.warm_start = warm_start
+        self.engine = engine
         self._cov = None
+        self._cond_vol = None
+        self._corr = None
+        self._params = None
 
     def fit(self, X, y=None):
         """
         X : array-like, shape (n_obs, n_series)
         """
-        X = np.asarray(X)
-        n_obs, n_ser = X.shape
+        if self.engine not in ("arch", "native"):
+            raise ValueError(f"Unknown engine '{self.engine}'")
+        if self.engine == "native" and (self.p, self.q) != (1, 1):
+            raise ValueError("The native engine fits GARCH(1,1) only")
 
-        # store conditional volatilities & standardized residuals
-        cond_vol = np.zeros((n_obs, n_ser))
-        std_resid = np.zeros((n_obs, n_ser))
+        index = getattr(X, "index", None)
+        window = ((index[0], index[-1], len(index))
+                  if isinstance(index, pd.DatetimeIndex) and len(index) else None)
+        tenors = list(X.columns) if hasattr(X, "columns") else None
+        X = np.asarray(X, dtype=float)
+        n_obs, n_ser = X.shape
+        tenors = list(range(n_ser)) if tenors is None else tenors
 
+        # 1) cached parameters / warm starts per tenor
+        params = np.zeros((n_ser, 1 + self.p + self.q))
+        todo, tasks = [], []
+        digests = [_digest(X[:, i]) for i in range(n_ser)]
         for i in range(n_ser):
-            # zero‐mean GARCH(p,q)
-            g = arch_model(X[:, i], mean="zero", vol="GARCH",
-                           p=self.p, q=self.q, dist="normal")
-            res = g.fit(disp="off")
-            cond_vol[:, i] = res.conditional_volatility
-            std_resid[:, i] = res.resid / cond_vol[:, i]
+            hit, start = _cached_params(tenors[i], self.engine, window, digests[i], self.p, self.q)
+            if hit is not None:
+                params[i] = hit
+                continue
+            todo.append(i)
+            tasks.append((X[:, i], self.p, self.q, start if self.warm_start else None))
+
+        # 2) zero‐mean GARCH(p,q) fits: jointly, serially or on the process pool
+        n_jobs = os.cpu_count() if self.n_jobs is None else self.n_jobs
+        if self.engine == "native" and tasks:
+            starts = np.array([np.full(3, np.nan) if t[3] is None else t[3] for t in tasks])
+            fitted, _, _ = fit_garch11(X[:, todo], starts)
+        elif n_jobs > 1 and len(tasks) > 1:
+            fitted = list(_pool(n_jobs).map(_fit_series, tasks))
+        else:
+            fitted = [_fit_series(task) for task in tasks]
+        for i, par in zip(todo, fitted):
+            params[i] = par
+            _store_params(tenors[i], self.engine, window, digests[i], self.p, self.q, par)
+
+        # 3) conditional volatilities & standardized residuals, all series at once
+        p = self.p
+        sigma2 = garch_variance_filter(X, params[:, 0], params[:, 1:1 + p], params[:, 1 + p:])
+        cond_vol = np.sqrt(sigma2)
+        std_resid = X / cond_vol
 
         # static correlation of standardized residuals
         corr = np.corrcoef(std_resid.T)
@@ -43,16 +336,39 @@ class GARCHCovarianceModel(BaseEstimator):
         last_sigma = cond_vol[-1, :]
         D = np.diag(last_sigma)
         self._cov = D @ corr @ D
+
+        self._cond_vol, self._corr, self._params = cond_vol, corr, params
         return self
 
     def predict(self, X):
         """
-        Returns the same covariance matrix for each sample in X.
+        Returns the same covariance matrix for each sample in X, as a
+        read-only (m, N, N) broadcast view.
         """
         m = np.asarray(X).shape[0]
-        return np.repeat(self._cov[np.newaxis, :, :], m, axis=0)
+        return np.broadcast_to(self._cov, (m,) + self._cov.shape)
+
+    def predict_path(self, X):
+        """
+        Conditional covariances D_t · R · D_t, shape (T, N, N), for the rows
+        of X: volatilities filtered with the fitted per-series parameters,
+        correlation held at the fitted R.
+        """
+        X = np.asarray(X, dtype=float)
+        p = self.p
+        sigma2 = garch_variance_filter(X, self._params[:, 0], self._params[:, 1:1 + p],
+                                       self._params[:, 1 + p:])
+        return self._path(np.sqrt(sigma2))
+
+    def _path(self, cond_vol):
+        return cond_vol[:, :, np.newaxis] * self._corr[np.newaxis] * cond_vol[:, np.newaxis, :]
 
     @property
     def covariance_(self):
         """Latest estimated covariance matrix."""
         return self._cov
+
+    @property
+    def covariance_path_(self):
+        """D_t · R · D_t at every fit observation, shape (n_obs, N, N)."""
+        return None if self._cond_vol is None else self._path(self._cond_vol)
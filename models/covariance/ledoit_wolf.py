@@ -9,6 +9,7 @@ class LedoitWolfCovarianceModel(BaseEstimator):
 
     def __init__(self):
         self._cov = None
+        self._n_obs = 0
 
     def fit(self, X, y=None):
         """
@@ -16,15 +17,28 @@ class LedoitWolfCovarianceModel(BaseEstimator):
         """
         lw = LedoitWolf().fit(X)
         self._cov = lw.covariance_
+        self._n_obs = np.shape(X)[0]
         return self
 
     def predict(self, X):
         """
-        We just return the same covariance for each sample.
+        We just return the same covariance for each sample, as a read-only
+        (m, N, N) broadcast view (no copies).
         """
         m = X.shape[0]
-        return np.repeat(self._cov[np.newaxis, :, :], m, axis=0)
+        return np.broadcast_to(self._cov, (m,) + self._cov.shape)
+
+    def predict_path(self, X):
+        """The static covariance is its own conditional path."""
+        return self.predict(X)
 
     @property
     def covariance_(self):
         return self._cov
+
+    @property
+    def covariance_path_(self):
+        """Covariance at each fit observation: a broadcast view of covariance_."""
+        if self._cov is None:
+            return None
+        return np.broadcast_to(self._cov, (self._n_obs,) + self._cov.shape)
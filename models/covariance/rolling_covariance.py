@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+
+class RollingCovariance:
+    """
+    Covariances of many windows of one delta history from prefix sums.
+
+    The history is scanned once to build cumulative sums of the deltas x_t,
+    their outer products x_t x_t', q_t = ‖x_t‖², q_t² and q_t⋅x_t.  Any window
+    [start, end) is then a difference of two prefix rows, so the empirical
+    (EmpiricalCovarianceModel) and Ledoit–Wolf (LedoitWolfCovarianceModel)
+    estimates of W windows cost O(T⋅N² + W⋅N²) in total instead of one
+    rescan per window.
+
+    Deltas are centered on their full-history mean before accumulating;
+    covariances are shift-invariant, and it keeps the prefix differences
+    well-conditioned over long histories.
+    """
+
+    def __init__(self, deltas):
+        index = getattr(deltas, "index", None)
+        X = np.asarray(deltas, dtype=float)
+        self.index = index
+        self.curve_dates = None
+
+        Y = X - X.mean(axis=0) if len(X) else X
+        q = np.einsum("ti,ti->t", Y, Y)
+
+        def prefix(a):
+            return np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+
+        self._n  = X.shape[1]
+        self._s1 = prefix(Y)                                    # Σ x
+        self._s2 = prefix(np.einsum("ti,tj->tij", Y, Y))        # Σ x x'
+        self._q  = prefix(q)                                    # Σ q
+        self._q2 = prefix(q ** 2)                               # Σ q²
+        self._qx = prefix(q[:, np.newaxis] * Y)                 # Σ q⋅x
+
+    @classmethod
+    def from_levels(cls, levels):
+        """
+        Build from a curve_date × tenor level pivot (already gap-filled, as in
+        the cone job); the deltas are its first differences.  Keeps the curve
+        dates so calendar windows can be resolved with windows().
+        """
+        levels = levels.sort_index()
+        engine = cls(levels.diff().iloc[1:])
+        engine.curve_dates = pd.DatetimeIndex(levels.index)
+        return engine
+
+    def windows(self, as_of_dates, years=1):
+        """
+        Delta-row bounds (starts, ends) of the cone job's fit windows: curve
+        dates in [as_of − years, as_of], differenced, so the window holds the
+        deltas whose both endpoints lie inside it.
+        """
+        if self.curve_dates is None:
+            raise ValueError("Calendar windows need an engine built with from_levels()")
+        as_of = pd.DatetimeIndex(pd.to_datetime(as_of_dates))
+        lo = pd.DatetimeIndex([d - relativedelta(years=years) for d in as_of])
+        starts = np.searchsorted(self.curve_dates.values, lo.values, side="left")
+        ends = np.searchsorted(self.curve_dates.values, as_of.values, side="right") - 1
+        return starts, np.maximum(ends, starts)
+
+    # ── window moments ───────────────────────────────────────────────────
+    def _sums(self, starts, ends):
+        s = np.asarray(starts, dtype=np.int64)
+        e = np.asarray(ends, dtype=np.int64)
+
+        def diff(a):
+            return a[e] - a[s]
+
+        return ((e - s).astype(float), diff(self._s1), diff(self._s2),
+                diff(self._q), diff(self._q2), diff(self._qx))
+
+    def empirical(self, starts, ends):
+        """
+        Maximum-likelihood covariance (sklearn EmpiricalCovariance) of each
+        window [start, end).
+
+        Returns:
+          (W, N, N) covariances
+        """
+        n, s1, s2, _, _, _ = self._sums(starts, ends)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mu = s1 / n[:, np.newaxis]
+            return s2 / n[:, np.newaxis, np.newaxis] - np.einsum("wi,wj->wij", mu, mu)
+
+    def ledoit_wolf(self, starts, ends):
+        """
+        Ledoit–Wolf shrunk covariance of each window, with the same shrinkage
+        formula as sklearn's ledoit_wolf_shrinkage.  The fourth-moment term
+        Σ‖x_t − μ‖⁴ is expanded in the prefix-summed moments:
+
+          Σq² + 2m⋅Σq − 3n⋅m² − 4μ⋅Σ(q⋅x) + 4μ'⋅Σ(xx')⋅μ,   m = ‖μ‖²
+
+        Returns:
+          covs (W, N, N), shrinkage (W,)
+        """
+        n, s1, s2, sq, sq2, sqx = self._sums(starts, ends)
+        p = self._n
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mu = s1 / n[:, np.newaxis]
+            emp = s2 / n[:, np.newaxis, np.newaxis] - np.einsum("wi,wj->wij", mu, mu)
+            if p == 1:
+                return emp, np.zeros(len(n))
+
+            m = np.einsum("wi,wi->w", mu, mu)
+            fourth = (sq2 + 2 * m * sq - 3 * n * m ** 2
+                      - 4 * np.einsum("wi,wi->w", mu, sqx)
+                      + 4 * np.einsum("wi,wij,wj->w", mu, s2, mu))
+
+            trace = np.trace(emp, axis1=1, axis2=2)
+            scale = trace / p
+            delta_ = np.einsum("wij,wij->w", emp, emp)
+            beta = (fourth / n - delta_) / (p * n)
+            delta = (delta_ - 2 * scale * trace + p * scale ** 2) / p
+            beta = np.minimum(beta, delta)
+            shrinkage = np.where(beta == 0, 0.0, beta / delta)
+
+        covs = (1 - shrinkage)[:, np.newaxis, np.newaxis] * emp
+        covs += (shrinkage * scale)[:, np.newaxis, np.newaxis] * np.eye(p)
+        return covs, shrinkage
@@ -0,0 +1,104 @@
+import numpy as np
+
+from models.curves.interpolation import interpolate_curves
+from models.curves.yield_curve import YieldCurve
+
+ZERO_CURVE_TYPE = "US Treasury Zero"
+
+
+def bootstrap_zero_curves(tenors, par_rates, freq_per_year=2, bill_cutoff=None):
+    """
+    Par → zero bootstrap for a whole history of par curves at once.
+
+    The loop runs over the coupon grid (60 semi-annual points out to 30y);
+    every step is vectorized across all D curves.
+
+      • Par rates (percent) are interpolated linearly onto the grid, skipping
+        missing tenors and held flat beyond the quoted ones.
+      • Points up to `bill_cutoff` (default: the first coupon date, 1/f) are
+        bills: DF = 1 / (1 + r·t).
+      • Beyond it, the par bond with coupon c prices at 1:
+          DF(Tₙ) = (1 − c/f · Σₖ₌₁ⁿ⁻¹ DF(Tₖ)) / (1 + c/f)
+
+    Args:
+      tenors    : (K,) par tenors in years
+      par_rates : (K,) or (D × K) par rates in percent, NaN where missing
+      freq_per_year : coupon frequency of the par bonds
+      bill_cutoff   : longest tenor priced as a discount bill (None → 1/f);
+                      anything longer comes from the par recursion, so a
+                      flat par curve gives a flat zero curve on the grid
+
+    Returns:
+      grid  (G,)      tenors: the quoted bill tenors below the first coupon
+                      date followed by the coupon grid
+      zeros (D × G)   continuously compounded zero rates in percent
+      dfs   (D × G)   discount factors
+
+    >>> grid, zeros, _ = bootstrap_zero_curves([0.5, 1, 2, 5, 10, 30], [5.0] * 6)
+    >>> bool(np.allclose(zeros, 200 * np.log(1.025)))
+    True
+    """
+    tenors = np.asarray(tenors, dtype=float)
+    par = np.atleast_2d(np.asarray(par_rates, dtype=float))
+    step = 1.0 / freq_per_year
+    bill_cutoff = step if bill_cutoff is None else bill_cutoff
+
+    n = int(round(np.nanmax(tenors) * freq_per_year))
+    coupon_grid = step * np.arange(1, n + 1)
+    short = tenors[tenors < step - 1e-9]
+    grid = np.concatenate([np.unique(short), coupon_grid])
+
+    # 1) par rates on the grid, all dates in one call
+    c = interpolate_curves(tenors, par, grid, method="linear", extrapolation="flat") / 100.0
+
+    # 2) bills: simple discounting
+    dfs = np.empty_like(c)
+    bill = grid <= bill_cutoff + 1e-9
+    dfs[:, bill] = 1.0 / (1.0 + c[:, bill] * grid[bill])
+
+    # 3) coupon bonds: one step per grid point, vectorized over dates
+    n_short = len(short)
+    annuity = np.zeros(len(par))
+    for k in range(n_short, len(grid)):
+        if not bill[k]:
+            cf = c[:, k] / freq_per_year
+            dfs[:, k] = (1.0 - cf * annuity) / (1.0 + cf)
+        annuity += dfs[:, k]
+
+    zeros = -np.log(dfs) / grid * 100.0
+    return grid, zeros, dfs
+
+
+def bootstrap_yield_curve(yield_curve, freq_per_year=2, bill_cutoff=None):
+    """Zero YieldCurve (single or batch) from a par YieldCurve."""
+    grid, zeros, _ = bootstrap_zero_curves(yield_curve.tenors, yield_curve.rates,
+                                           freq_per_year, bill_cutoff)
+    rates = zeros if yield_curve.is_batch else zeros[0]
+    return YieldCurve(grid, rates, yield_curve.extrapolation, yield_curve.method)
+
+
+def sync_zero_store(par_store, zero_store=None, freq_per_year=2, bill_cutoff=None):
+    """
+    Bootstrap every par curve_date not yet in the zero store and append it.
+
+    Args:
+      par_store  : synced CurveStore of par curves
+      zero_store : CurveStore for the zero curves (default: ZERO_CURVE_TYPE
+                   next to par_store)
+
+    Returns:
+      the zero CurveStore
+    """
+    from data.curve_store import CurveStore
+
+    if zero_store is None:
+        zero_store = CurveStore(ZERO_CURVE_TYPE, root=par_store.path.parent)
+
+    dates, par = par_store.dates, par_store.rates
+    if len(zero_store):
+        start = np.searchsorted(dates, zero_store.dates[-1], side="right")
+        dates, par = dates[start:], par[start:]
+    if len(dates):
+        grid, zeros, _ = bootstrap_zero_curves(par_store.tenors, par, freq_per_year, bill_cutoff)
+        zero_store.append(dates, grid, zeros)
+    return zero_store
@@ -0,0 +1,261 @@
+import numpy as np
+from scipy import sparse
+
+
+def linear_interpolation_operator(tenors, t, extrapolation="linear"):
+    """
+    Sparse linear-interpolation operator W of shape (len(t) × len(tenors)).
+
+    For any node rates r (n_tenors,) — or a stack R (n_tenors × S) —
+    W @ r gives the linearly interpolated rates at the points t, so a fixed
+    cashflow grid pays for the bracket search once and every curve after that
+    is a single sparse matmul.  Each row has at most two non-zeros.
+
+    extrapolation:
+      "linear" → extend the first/last segment (matches interp1d(..., fill_value="extrapolate"))
+      "flat"   → hold the end node rates (matches np.interp)
+    """
+    if extrapolation not in ("linear", "flat"):
+        raise ValueError(f"Unknown extrapolation '{extrapolation}'")
+
+    x = np.asarray(tenors, dtype=float)
+    t = np.asarray(t, dtype=float).ravel()
+    m, k = len(t), len(x)
+    rows = np.arange(m)
+
+    if k == 1:
+        return sparse.csr_matrix((np.ones(m), (rows, np.zeros(m, dtype=int))), shape=(m, 1))
+
+    # left node of the bracketing segment (end segments for points outside the grid)
+    j = np.clip(np.searchsorted(x, t, side='right') - 1, 0, k - 2)
+    w = (t - x[j]) / (x[j + 1] - x[j])
+    if extrapolation == "flat":
+        w = np.clip(w, 0.0, 1.0)
+
+    data = np.concatenate([1.0 - w, w])
+    cols = np.concatenate([j, j + 1])
+    return sparse.csr_matrix((data, (np.tile(rows, 2), cols)), shape=(m, k))
+
+
+METHODS = ("linear", "cubic", "monotone_convex")
+
+
+def _as_batch(tenors, rates, t):
+    """(x, R, t_flat, out_shape) with R always (S × n_tenors)."""
+    x = np.asarray(tenors, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    t = np.asarray(t, dtype=float)
+    shape = t.shape if rates.ndim == 1 else (rates.shape[0],) + t.shape
+    return x, np.atleast_2d(rates), t.ravel(), shape
+
+
+def natural_cubic_second_derivatives(tenors, rates):
+    """
+    Second derivatives M at the nodes of the natural cubic spline through
+    (tenors, rates), for one curve (n_tenors,) or a batch (S × n_tenors).
+
+    The tridiagonal system depends only on the tenor grid, so all S curves
+    are solved together as S right-hand sides of one banded solve.
+    """
+    from scipy.linalg import solve_banded
+
+    x = np.asarray(tenors, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    R = np.atleast_2d(rates)
+    M = np.zeros_like(R)
+    k = len(x)
+    if k < 3:
+        return M.reshape(rates.shape)
+
+    h = np.diff(x)
+    slope = np.diff(R, axis=1) / h                  # (S, k-1)
+    rhs = 6.0 * np.diff(slope, axis=1)              # (S, k-2)
+
+    ab = np.zeros((3, k - 2))
+    ab[0, 1:] = h[1:-1]                             # super-diagonal
+    ab[1] = 2.0 * (h[:-1] + h[1:])                  # diagonal
+    ab[2, :-1] = h[1:-1]                            # sub-diagonal
+    M[:, 1:-1] = solve_banded((1, 1), ab, rhs.T).T
+    return M.reshape(rates.shape)
+
+
+def natural_cubic_interpolate(tenors, rates, t, extrapolation="linear"):
+    """
+    Natural cubic spline through the node rates, evaluated at t.
+
+    rates is (n_tenors,) → result shaped like t, or (S × n_tenors) → (S,) + t.shape.
+
+    extrapolation:
+      "linear" → continue along the end tangents (the spline's own zero-curvature ends)
+      "flat"   → hold the end node rates
+    """
+    if extrapolation not in ("linear", "flat"):
+        raise ValueError(f"Unknown extrapolation '{extrapolation}'")
+
+    x, R, t, shape = _as_batch(tenors, rates, t)
+    k = len(x)
+    if k == 1:
+        return np.broadcast_to(R[:, :1], (R.shape[0], len(t))).reshape(shape).copy()
+
+    M = natural_cubic_second_derivatives(x, R)
+    tc = np.clip(t, x[0], x[-1])
+    j = np.clip(np.searchsorted(x, tc, side='right') - 1, 0, k - 2)
+    h = x[j + 1] - x[j]
+    a = (x[j + 1] - tc) / h
+    b = 1.0 - a
+    out = (a * R[:, j] + b * R[:, j + 1]
+           + ((a ** 3 - a) * M[:, j] + (b ** 3 - b) * M[:, j + 1]) * h ** 2 / 6.0)
+
+    if extrapolation == "linear":
+        h0, hn = x[1] - x[0], x[-1] - x[-2]
+        d0 = (R[:, 1] - R[:, 0]) / h0 - h0 * M[:, 1] / 6.0
+        dn = (R[:, -1] - R[:, -2]) / hn + hn * M[:, -2] / 6.0
+        out = out + np.where(t < x[0], (t - x[0]) * d0[:, None], 0.0)
+        out = out + np.where(t > x[-1], (t - x[-1]) * dn[:, None], 0.0)
+
+    return out.reshape(shape)
+
+
+def _monotone_convex(tenors, rates, t, extrapolation):
+    """
+    Hagan–West monotone-convex interpolation of continuously compounded zero
+    rates, for a batch of curves.  Returns (zero, forward), each (S × m).
+
+    The curve is anchored at τ = 0; node forwards are the tenor-weighted
+    averages of the neighbouring discrete forwards, and within each interval
+    the forward is fd + g(x) with g chosen by the four Hagan–West regions so
+    that forwards stay monotone where the discrete forwards are and the zero
+    rates are reproduced exactly at the nodes.
+    """
+    x, R, t = tenors, rates, t
+    S = R.shape[0]
+    tau = np.concatenate([[0.0], x])
+    y = np.hstack([np.zeros((S, 1)), R * x])        # r·τ at the nodes
+    h = np.diff(tau)
+    fd = np.diff(y, axis=1) / h                     # (S, n) discrete forwards
+
+    n = len(x)
+    f = np.empty((S, n + 1))
+    if n > 1:
+        wl = h[:-1] / (h[:-1] + h[1:])
+        f[:, 1:-1] = wl * fd[:, 1:] + (1.0 - wl) * fd[:, :-1]
+        f[:, 0] = fd[:, 0] - 0.5 * (f[:, 1] - fd[:, 0])
+        f[:, -1] = fd[:, -1] - 0.5 * (f[:, -2] - fd[:, -1])
+    else:
+        f[:] = fd
+
+    tc = np.clip(t, 0.0, x[-1])
+    j = np.clip(np.searchsorted(tau, tc, side='right') - 1, 0, n - 1)
+    u = (tc - tau[j]) / h[j]
+    g0 = f[:, j] - fd[:, j]
+    g1 = f[:, j + 1] - fd[:, j]
+
+    # 1) classify each point's interval into the Hagan–West regions
+    r1 = (((g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2.0 * g0))
+          | ((g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2.0 * g0)))
+    r2 = ~r1 & (((g0 < 0) & (g1 > -2.0 * g0)) | ((g0 > 0) & (g1 < -2.0 * g0)))
+    r3 = ~r1 & ~r2 & (((g0 > 0) & (g1 < 0)) | ((g0 < 0) & (g1 > 0)))
+    flat = (g0 == 0) & (g1 == 0)
+
+    # 2) g(u) and G(u) = ∫₀ᵘ g in every region, then select
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g_1 = g0 * (1 - 4 * u + 3 * u ** 2) + g1 * (-2 * u + 3 * u ** 2)
+        G_1 = g0 * (u - 2 * u ** 2 + u ** 3) + g1 * (-u ** 2 + u ** 3)
+
+        eta = (g1 + 2 * g0) / (g1 - g0)
+        after = u > eta
+        g_2 = np.where(after, g0 + (g1 - g0) * ((u - eta) / (1 - eta)) ** 2, g0)
+        G_2 = g0 * u + np.where(after, (g1 - g0) * (u - eta) ** 3 / (3 * (1 - eta) ** 2), 0.0)
+
+        eta = 3 * g1 / (g1 - g0)
+        before = u < eta
+        g_3 = np.where(before, g1 + (g0 - g1) * ((eta - u) / eta) ** 2, g1)
+        G_3 = g1 * u + (g0 - g1) / 3 * np.where(before, eta - (eta - u) ** 3 / eta ** 2, eta)
+
+        eta = g1 / (g1 + g0)
+        A = -g0 * g1 / (g0 + g1)
+        before = u <= eta
+        g_4 = np.where(before, A + (g0 - A) * ((eta - u) / eta) ** 2,
+                       A + (g1 - A) * ((u - eta) / (1 - eta)) ** 2)
+        G_4 = A * u + (g0 - A) / 3 * np.where(before, eta - (eta - u) ** 3 / eta ** 2, eta)
+        G_4 = G_4 + np.where(before, 0.0, (g1 - A) * (u - eta) ** 3 / (3 * (1 - eta) ** 2))
+
+    g = np.select([flat, r1, r2, r3], [0.0, g_1, g_2, g_3], g_4)
+    G = np.select([flat, r1, r2, r3], [0.0, G_1, G_2, G_3], G_4)
+
+    # 3) zero rates from the integrated forward; the limit at τ = 0 is f(0)
+    rt = y[:, j] + fd[:, j] * (tc - tau[j]) + h[j] * G
+    fwd = fd[:, j] + g
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zero = np.where(tc > 0, rt / tc, f[:, :1])
+
+    # 4) beyond the last node: hold the end forward, or the end zero rate
+    beyond = t > x[-1]
+    if beyond.any():
+        if extrapolation == "linear":
+            ext = (y[:, -1:] + f[:, -1:] * (t - x[-1])) / np.where(beyond, t, 1.0)
+            zero = np.where(beyond, ext, zero)
+            fwd = np.where(beyond, f[:, -1:], fwd)
+        else:
+            zero = np.where(beyond, R[:, -1:], zero)
+            fwd = np.where(beyond, R[:, -1:], fwd)
+
+    return zero, fwd
+
+
+def monotone_convex_interpolate(tenors, rates, t, extrapolation="linear", forward=False):
+    """
+    Hagan–West monotone-convex interpolation of zero rates (percent,
+    continuously compounded), evaluated at t for one curve or a batch.
+
+    rates is (n_tenors,) → result shaped like t, or (S × n_tenors) → (S,) + t.shape.
+    With forward=True the instantaneous forward rates are returned instead.
+
+    extrapolation (beyond the last node; the short end is anchored at τ = 0):
+      "linear" → hold the last instantaneous forward
+      "flat"   → hold the last zero rate
+    """
+    if extrapolation not in ("linear", "flat"):
+        raise ValueError(f"Unknown extrapolation '{extrapolation}'")
+
+    x, R, t, shape = _as_batch(tenors, rates, t)
+    zero, fwd = _monotone_convex(x, R, t, extrapolation)
+    return (fwd if forward else zero).reshape(shape)
+
+
+def interpolate_curves(tenors, rates, t, method="linear", extrapolation="linear"):
+    """
+    Evaluate a stack of curves (S × n_tenors) at t with any METHODS entry,
+    skipping missing (NaN) node rates.
+
+    Rows are grouped by their pattern of available tenors and each group is
+    interpolated as one batch, so a full history with a handful of distinct
+    gaps costs a handful of vectorized calls rather than one per date.
+
+    Returns:
+      (S,) + t.shape interpolated rates (NaN for rows with no data)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown interpolation method '{method}'")
+
+    x = np.asarray(tenors, dtype=float)
+    R = np.atleast_2d(np.asarray(rates, dtype=float))
+    t = np.asarray(t, dtype=float)
+    out = np.full((R.shape[0], t.size), np.nan)
+
+    have = ~np.isnan(R)
+    patterns, codes = np.unique(have, axis=0, return_inverse=True)
+    codes = codes.ravel()
+    for p, mask in enumerate(patterns):
+        if not mask.any():
+            continue
+        rows = np.flatnonzero(codes == p)
+        xs, Rs = x[mask], R[np.ix_(rows, mask)]
+        if method == "linear":
+            out[rows] = (linear_interpolation_operator(xs, t, extrapolation) @ Rs.T).T
+        elif method == "cubic":
+            out[rows] = natural_cubic_interpolate(xs, Rs, t.ravel(), extrapolation)
+        else:
+            out[rows] = monotone_convex_interpolate(xs, Rs, t.ravel(), extrapolation)
+
+    return out.reshape((R.shape[0],) + t.shape)
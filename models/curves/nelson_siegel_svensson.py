@@ -0,0 +1,218 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+
+PARAMS = ("beta0", "beta1", "beta2", "beta3", "tau1", "tau2")
+TAU_BOUNDS = (0.05, 30.0)
+
+
+def nss_loadings(t, tau1, tau2):
+    """
+    NSS factor loadings [1, L(t/τ1), C(t/τ1), C(t/τ2)] with L(x) = (1 − e⁻ˣ)/x
+    and C(x) = L(x) − e⁻ˣ.
+
+    t is (m,); tau1, tau2 broadcast against each other (shape P).
+
+    Returns:
+      (P..., m, 4) loadings
+    """
+    t = np.maximum(np.asarray(t, dtype=float), 1e-10)
+    tau1 = np.asarray(tau1, dtype=float)[..., np.newaxis]
+    tau2 = np.asarray(tau2, dtype=float)[..., np.newaxis]
+
+    x1, x2 = t / tau1, t / tau2
+    e1, e2 = np.exp(-x1), np.exp(-x2)
+    l1 = (1.0 - e1) / x1
+    l2 = (1.0 - e2) / x2
+    l1, l2, e1, e2 = np.broadcast_arrays(l1, l2, e1, e2)
+    return np.stack([np.ones_like(l1), l1, l1 - e1, l2 - e2], axis=-1)
+
+
+def nss_rates(params, t):
+    """
+    Rates (percent) of one parameter row (6,) → shape of t, or of D rows
+    (D × 6) → (D,) + t.shape, evaluated in one vectorized pass.
+    """
+    params = np.asarray(params, dtype=float)
+    t = np.asarray(t, dtype=float)
+    P = np.atleast_2d(params)
+    B = nss_loadings(t.ravel(), P[:, 4], P[:, 5])            # (D, m, 4)
+    out = np.einsum("dmk,dk->dm", B, P[:, :4])
+    return out.reshape(t.shape) if params.ndim == 1 else out.reshape((len(P),) + t.shape)
+
+
+class NelsonSiegelSvensson:
+    """
+    Callable NSS curve(s), TTM (years) → rate (percent), from compact
+    parameter rows (6,) or (D × 6) in PARAMS order.  Indexing a batch gives
+    the single-date curve, so a batch can be passed wherever a sequence of
+    curves is expected (e.g. Bond.price_batch_scenarios).
+    """
+
+    def __init__(self, params):
+        self.params = np.asarray(params, dtype=float)
+
+    @property
+    def is_batch(self):
+        return self.params.ndim == 2
+
+    def __len__(self):
+        return len(self.params) if self.is_batch else 1
+
+    def __getitem__(self, i):
+        if not self.is_batch:
+            raise TypeError("Cannot index a single NSS curve")
+        return NelsonSiegelSvensson(self.params[i])
+
+    def __call__(self, t):
+        return nss_rates(self.params, t)
+
+    def __repr__(self):
+        kind = f"batch of {len(self)}" if self.is_batch else "single"
+        return f"NelsonSiegelSvensson({kind})"
+
+
+def nss_grid_fit(tenors, rates, tau1_grid=None, tau2_grid=None):
+    """
+    Profile least squares over a (τ1, τ2) grid for many curves at once.
+
+    For fixed τ the betas are linear, so each grid pair is one pseudo-inverse
+    of its (m × 4) loadings applied to all D curves together; the pair with
+    the smallest SSE is kept per curve.  Curves are grouped by their pattern
+    of missing tenors so every group shares one set of loadings.
+
+    Returns:
+      params (D × 6), sse (D,)
+    """
+    tau1_grid = np.geomspace(0.25, 8.0, 12) if tau1_grid is None else np.asarray(tau1_grid, dtype=float)
+    tau2_grid = np.geomspace(2.0, 30.0, 12) if tau2_grid is None else np.asarray(tau2_grid, dtype=float)
+    t1, t2 = np.meshgrid(tau1_grid, tau2_grid, indexing="ij")
+    keep = t1 < t2                              # identify τ1 as the short hump
+    t1, t2 = t1[keep], t2[keep]
+
+    x = np.asarray(tenors, dtype=float)
+    Y = np.atleast_2d(np.asarray(rates, dtype=float))
+    params = np.full((len(Y), 6), np.nan)
+    sse = np.full(len(Y), np.inf)
+
+    have = ~np.isnan(Y)
+    patterns, codes = np.unique(have, axis=0, return_inverse=True)
+    codes = codes.ravel()
+    for p, mask in enumerate(patterns):
+        if mask.sum() < 4:
+            continue
+        rows = np.flatnonzero(codes == p)
+        y = Y[np.ix_(rows, mask)]                                 # (d, m)
+        B = nss_loadings(x[mask], t1, t2)                         # (P, m, 4)
+        beta = np.linalg.pinv(B) @ y.T                            # (P, 4, d)
+        resid = B @ beta - y.T[np.newaxis]                        # (P, m, d)
+        err = np.einsum("pmd,pmd->pd", resid, resid)
+        best = np.argmin(err, axis=0)
+        cols = np.arange(len(rows))
+        params[rows, :4] = beta[best, :, cols]
+        params[rows, 4], params[rows, 5] = t1[best], t2[best]
+        sse[rows] = err[best, cols]
+
+    return params, sse
+
+
+def _nss_jacobian(params, t):
+    """Analytic (m × 6) Jacobian of nss_rates(params, t) for one parameter row."""
+    b1, b2, b3, tau1, tau2 = params[1:]
+    t = np.maximum(t, 1e-10)
+    J = np.empty((len(t), 6))
+    J[:, :4] = nss_loadings(t, tau1, tau2)
+    for tau, col in ((tau1, 4), (tau2, 5)):
+        x = t / tau
+        e = np.exp(-x)
+        dl = (e * (x + 1.0) - 1.0) / x ** 2          # dL/dx
+        dc = dl + e                                 # dC/dx
+        dx = -x / tau                               # dx/dτ
+        J[:, col] = (b1 * dl + b2 * dc) * dx if col == 4 else b3 * dc * dx
+    return J
+
+
+def _refine_chunk(args):
+    """Sequential least_squares over one contiguous block of dates."""
+    tenors, rates, start = args
+    lo = [-np.inf] * 4 + [TAU_BOUNDS[0]] * 2
+    hi = [np.inf] * 4 + [TAU_BOUNDS[1]] * 2
+
+    out = start.copy()
+    prev = None
+    for i, y in enumerate(rates):
+        ok = ~np.isnan(y)
+        if ok.sum() < 6 or np.isnan(start[i]).any():
+            continue
+        t, y = tenors[ok], y[ok]
+
+        def resid(p):
+            return nss_rates(p, t) - y
+
+        def jac(p):
+            return _nss_jacobian(p, t)
+
+        # warm start from yesterday when it already fits better than the grid
+        x0 = start[i]
+        if prev is not None and np.sum(resid(prev) ** 2) < np.sum(resid(x0) ** 2):
+            x0 = prev
+        x0 = np.clip(x0, np.array(lo) + 1e-12, np.array(hi) - 1e-12)
+        out[i] = prev = least_squares(resid, x0, jac=jac, bounds=(lo, hi), method="trf",
+                                        x_scale="jac").x
+    return out
+
+
+def fit_nss(tenors, rates, n_jobs=None, chunk_size=250, tau1_grid=None, tau2_grid=None,
+            refine=True):
+    """
+    Calibrate NSS parameters for every curve in a (D × K) history.
+
+      1) batched grid search over (τ1, τ2) with linear least squares for the betas
+      2) nonlinear refinement of all six parameters per date, warm-started
+         from the previous date within contiguous chunks of `chunk_size`
+         dates, with chunks fitted in parallel on a process pool
+
+    Args:
+      tenors : (K,) years
+      rates  : (D × K) percent, NaN where missing (dates in time order)
+      n_jobs : worker processes (None → os.cpu_count(), 1 → serial)
+      refine : False → stop after the batched grid fit (step 1 only)
+
+    Returns:
+      params (D × 6) in PARAMS order, rmse (D,) in percent
+    """
+    tenors = np.asarray(tenors, dtype=float)
+    rates = np.atleast_2d(np.asarray(rates, dtype=float))
+    start, _ = nss_grid_fit(tenors, rates, tau1_grid, tau2_grid)
+
+    bounds = range(0, len(rates), chunk_size) if refine else []
+    tasks = [(tenors, rates[i:i + chunk_size], start[i:i + chunk_size]) for i in bounds]
+    if n_jobs == 1 or len(tasks) <= 1:
+        chunks = [_refine_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(_refine_chunk, tasks))
+    params = np.concatenate(chunks) if chunks else start
+
+    fitted = nss_rates(params, tenors)
+    rmse = np.sqrt(np.nanmean((fitted - rates) ** 2, axis=1))
+    return params, rmse
+
+
+def fit_nss_history(store, start_date=None, end_date=None, **kwargs):
+    """
+    NSS parameters for every curve_date of a CurveStore window.
+
+    Returns:
+      DataFrame indexed by curve_date with PARAMS columns and 'rmse'
+    """
+    start = store.dates[0] if start_date is None else start_date
+    end = store.dates[-1] if end_date is None else end_date
+    dates, rates = store.window(start, end)
+    params, rmse = fit_nss(store.tenors, np.asarray(rates), **kwargs)
+
+    out = pd.DataFrame(params, columns=list(PARAMS), index=pd.DatetimeIndex(dates, name="curve_date"))
+    out["rmse"] = rmse
+    return out
@@ -0,0 +1,152 @@
+import numpy as np
+
+from scipy import sparse
+
+from models.curves.interpolation import (
+    METHODS,
+    linear_interpolation_operator,
+    monotone_convex_interpolate,
+    natural_cubic_interpolate,
+)
+
+
+class YieldCurve:
+    """
+    Yield curve held as node tenors and node rates (percent).
+
+    `rates` is either (n_tenors,) for a single curve or (S × n_tenors) for a
+    batch of S curves on the same tenor grid.  Curves are callable like the
+    interp1d they replace: a single curve maps t → rates of shape t.shape,
+    a batch maps t → (S,) + t.shape, evaluated for all curves with one
+    sparse interpolation matmul.
+
+    Bumps act on the node rates and return new curves, so stacked bumps stay
+    plain arrays instead of chains of closures.  Passing an array of S shifts
+    to a single curve returns a batch of S bumped curves.
+
+    method:
+      "linear"          → piecewise linear in the rates (default)
+      "cubic"           → natural cubic spline, batched tridiagonal solve
+      "monotone_convex" → Hagan–West, treating rates as continuous zero rates
+    """
+
+    def __init__(self, tenors, rates, extrapolation="linear", method="linear"):
+        if method not in METHODS:
+            raise ValueError(f"Unknown interpolation method '{method}'")
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.rates = np.asarray(rates, dtype=float)
+        self.extrapolation = extrapolation
+        self.method = method
+        if self.rates.shape[-1] != len(self.tenors):
+            raise ValueError("rates must have one column per tenor")
+        if np.any(np.diff(self.tenors) < 0):
+            order = np.argsort(self.tenors, kind="stable")
+            self.tenors, self.rates = self.tenors[order], self.rates[..., order]
+
+    # ── shape ────────────────────────────────────────────────────────────
+    @property
+    def is_batch(self):
+        return self.rates.ndim == 2
+
+    def __len__(self):
+        """Number of curves (1 for a single curve)."""
+        return self.rates.shape[0] if self.is_batch else 1
+
+    def __getitem__(self, i):
+        """Single curve i of a batch."""
+        if not self.is_batch:
+            raise TypeError("Cannot index a single YieldCurve")
+        return YieldCurve(self.tenors, self.rates[i], self.extrapolation, self.method)
+
+    @classmethod
+    def stack(cls, curves):
+        """Batch of curves sharing one tenor grid."""
+        curves = list(curves)
+        tenors = curves[0].tenors
+        if any(not np.array_equal(c.tenors, tenors) for c in curves):
+            raise ValueError("All curves must share the same tenor grid")
+        return cls(tenors, np.vstack([np.atleast_2d(c.rates) for c in curves]),
+                   curves[0].extrapolation, curves[0].method)
+
+    # ── evaluation ───────────────────────────────────────────────────────
+    def operator(self, t):
+        """
+        Sparse interpolation operator from this grid to the points t.  Only
+        defined for the methods that are linear in the node rates.
+        """
+        if self.method == "linear":
+            return linear_interpolation_operator(self.tenors, t, self.extrapolation)
+        if self.method == "cubic":
+            # the spline is linear in the rates: evaluate it on the unit vectors
+            unit = np.eye(len(self.tenors))
+            t = np.asarray(t, dtype=float).ravel()
+            return sparse.csr_matrix(natural_cubic_interpolate(self.tenors, unit, t, self.extrapolation).T)
+        raise ValueError(f"'{self.method}' interpolation is not linear in the node rates")
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        if self.method == "cubic":
+            return natural_cubic_interpolate(self.tenors, self.rates, t, self.extrapolation)
+        if self.method == "monotone_convex":
+            return monotone_convex_interpolate(self.tenors, self.rates, t, self.extrapolation)
+        out = self.operator(t) @ self.rates.T          # (m,) or (m, S)
+        if self.is_batch:
+            return out.T.reshape((len(self),) + t.shape)
+        return out.reshape(t.shape)
+
+    def forward(self, t):
+        """Instantaneous forward rates (percent, continuous) at t."""
+        t = np.asarray(t, dtype=float)
+        if self.method == "monotone_convex":
+            return monotone_convex_interpolate(self.tenors, self.rates, t, self.extrapolation, forward=True)
+        # f = d(r·t)/dt by central differences on the interpolated zero curve
+        eps = 1e-5
+        return ((t + eps) * self(t + eps) - (t - eps) * self(t - eps)) / (2 * eps)
+
+    # ── bumps ────────────────────────────────────────────────────────────
+    def _shifted(self, profile, shift_bp):
+        """New curve(s) with node rates + profile × shift_bp (bp → percent)."""
+        shift_pct = np.asarray(shift_bp, dtype=float) / 100.0
+        if shift_pct.ndim == 0:
+            return YieldCurve(self.tenors, self.rates + profile * shift_pct, self.extrapolation, self.method)
+        if self.is_batch:
+            raise ValueError("Array shifts apply to a single curve; bump a batch with a scalar")
+        rates = self.rates[np.newaxis, :] + np.multiply.outer(shift_pct, profile)
+        return YieldCurve(self.tenors, rates, self.extrapolation, self.method)
+
+    def parallel(self, shift_bp):
+        """Parallel shift(s) in bp."""
+        return self._shifted(np.ones_like(self.tenors), shift_bp)
+
+    def pca(self, loading, shift_bp, tenors=None):
+        """
+        PCA bump(s): rates move by loading × shift_bp.  `loading` is given on
+        `tenors` (default: this curve's grid) and held flat beyond it.
+        """
+        loading = np.asarray(loading, dtype=float)
+        if tenors is not None:
+            loading = np.interp(self.tenors, tenors, loading, left=loading[0], right=loading[-1])
+        return self._shifted(loading, shift_bp)
+
+    def key_rate(self, key, shift_bp, key_tenors=(1, 2, 3, 5, 7, 10, 20, 30)):
+        """
+        Key-rate bump(s) of shift_bp at `key`, using the KRD hat weights on the
+        nodes.  Inside the node grid this matches Bond's key-rate shocks when
+        the key tenors are nodes; beyond the grid the bump follows the curve's
+        extrapolation.
+        """
+        key_tenors = [float(k) for k in key_tenors]
+        keys = np.asarray(key_tenors)
+        i = key_tenors.index(float(key))
+        # hat function: 1 at the key, linear to 0 at its neighbours, flat at the ends
+        xp = keys[max(i - 1, 0):i + 2]
+        fp = (np.arange(len(xp)) == min(i, 1)).astype(float)
+        profile = np.interp(self.tenors, xp, fp,
+                            left=1.0 if i == 0 else 0.0,
+                            right=1.0 if i == len(keys) - 1 else 0.0)
+        return self._shifted(profile, shift_bp)
+
+    def __repr__(self):
+        kind = f"batch of {len(self)}" if self.is_batch else "single"
+        return (f"YieldCurve({kind}, {len(self.tenors)} tenors, method='{self.method}', "
+                f"extrapolation='{self.extrapolation}')")
@@ -1,7 +1,18 @@
 import pandas as pd
 import numpy as np
 
+from models.curves.yield_curve import YieldCurve
+from models.pricing_models.bond_portfolio import as_portfolio, segment_sum
+from models.pricing_models.schedule import coupon_schedule
+
 class Bond:
+    KEY_TENORS = [1, 2, 3, 5, 7, 10, 20, 30]
+    OUTPUTS    = ("dirty", "clean", "accrued", "dv01", "krd", "convexity")
+
+    # Rough peak working-set per cashflow, used to size chunks under max_memory_mb
+    SENSITIVITY_BYTES_PER_CF = 160
+    SCENARIO_BYTES_PER_CF    = 40   # plus 24 bytes per scenario
+
     def __init__(self, cusip, issue_date, maturity_date, coupon, frequency, quantity, face_value=100):
         self.cusip = cusip
         self.issue_date = pd.to_datetime(issue_date)
@@ -13,15 +24,9 @@ class Bond:
 
         # Determine periods per year
         self.freq_per_year = 2 if frequency == 'Semi-Annual' else 1
-        months = int(12 / self.freq_per_year)
 
-        # Build cashflow dates (vector of coupon dates)
-        dates = []
-        date = self.issue_date
-        while date < self.maturity_date:
-            date = date + pd.DateOffset(months=months)
-            dates.append(date)
-        self.dates = np.array(dates)
+        # Build cashflow dates (vector of coupon dates, memoized per schedule)
+        self.dates = coupon_schedule(self.issue_date, self.maturity_date, self.freq_per_year)
 
         # Cashflow amounts (vector)
         coupon_amt = self.face_value * self.coupon_rate / 100 / self.freq_per_year
@@ -84,115 +89,334 @@ class Bond:
 
         return shock_mats
 
+    @staticmethod
+    def make_krd_sparse_weights(ttm, key_tenors):
+        """
+        Sparse form of make_krd_shock_matrix: every cashflow time touches at
+        most two neighbouring key tenors, so store those two key indices and
+        their hat-function weights instead of a dense (n_keys × ...) tensor.
+
+        Flat weight 1 on the first key below it and on the last key above it,
+        linear in between; NaN times get zero weight.  Weights are per unit
+        shock (multiply by 0.01 for a 1bp shock in percent).
+
+        Returns (all shaped like ttm):
+          key_lo, key_hi  (int indices into key_tenors)
+          w_lo,   w_hi    (float weights, w_lo + w_hi = 1 for valid times)
+        """
+        keys = np.asarray(key_tenors, dtype=float)
+        t = np.asarray(ttm, dtype=float)
+        last = len(keys) - 1
+
+        # keys strictly below t: t ∈ (keys[j-1], keys[j]]
+        j = np.searchsorted(keys, np.nan_to_num(t), side='left')
+        inner = (j > 0) & (j <= last)
+
+        key_hi = np.clip(j, 0, last)
+        key_lo = np.where(inner, j - 1, key_hi)
+
+        span = keys[key_hi] - keys[key_lo]
+        w_hi = np.where(inner, (t - keys[key_lo]) / np.where(inner, span, 1.0), 0.0)
+        w_lo = 1.0 - w_hi
+
+        valid = ~np.isnan(t)
+        return key_lo, key_hi, np.where(valid, w_lo, 0.0), np.where(valid, w_hi, 0.0)
+
+    @staticmethod
+    def _chunk_cashflows(max_memory_mb, bytes_per_cf):
+        """Cashflows per block that keep the pricing working set under max_memory_mb."""
+        return max(int(max_memory_mb * 2**20 // bytes_per_cf), 1)
+
     @classmethod
-    def price_batch_with_sensitivities(cls, bonds, as_of_date, yield_curve):
+    def price_batch_with_sensitivities(cls, bonds, as_of_date, yield_curve,
+                                       sensitivities="bump", with_convexity=False,
+                                       key_tenors=None, max_memory_mb=None, outputs=None):
         """
-        Vectorized pricing for multiple Bond instances, computing:
+        Vectorized pricing for multiple bonds (a BondPortfolio or a list of
+        Bond instances), computing:
 
           • Dirty price (PV of all future CFs under base curve)
           • Accrued interest (AI) at as_of_date
           • Clean price = Dirty price − Accrued interest
           • dv01        (parallel 1bp shift): PV_base − PV(curve+1bp)
-          • krds        (per‐1bp key‐rate shocks at tenors [1,2,3,5,7,10,20,30])
+          • krds        (per‐1bp key‐rate shocks, default tenors Bond.KEY_TENORS)
+          • convexity   (optional) PV change per (1bp)², i.e. d²PV/dy² × 1e-8
+
+        sensitivities:
+          "bump"     → re-discount the cashflows under each shocked curve (reference mode)
+          "analytic" → closed form from the base discount factors:
+                         dv01      = Σ t·CF·DF × 1e-4
+                         krd_k     = Σ w_k(t)·t·CF·DF × 1e-4   (w_k = key-rate hat weight)
+                         convexity = Σ t²·CF·DF × 1e-8
+                       These are first-order in the shock, so they differ from the
+                       bump numbers by the second-order term (≈ ½·convexity per bp).
+
+        max_memory_mb:
+          None → price the whole portfolio in one pass.  Otherwise stream blocks
+          of consecutive bonds sized to this working-set budget through the
+          pricer and concatenate the results, so peak memory stays flat
+          regardless of portfolio size.
+
+        outputs:
+          None → legacy tuple below.  Otherwise a collection of names from
+          Bond.OUTPUTS ("dirty", "clean", "accrued", "dv01", "krd", "convexity");
+          only those are computed and a dict {name: array} is returned.  For
+          example outputs={"dirty"} costs a single discount pass, which is all
+          the PCA / parallel shock repricings need.
 
         Returns:
           pvs_base        (dirty prices),
           accrued_interest, 
           clean_prices,
           dv01            (1bp parallel),
-          krd_matrix      (each column is key‐rate DV for 1bp)
+          krd_matrix      (each column is key‐rate DV for 1bp),
+          convexity       (only when with_convexity=True)
         """
+        if sensitivities not in ("bump", "analytic"):
+            raise ValueError(f"Unknown sensitivities mode '{sensitivities}'")
+
+        if outputs is None:
+            legacy = ("dirty", "accrued", "clean", "dv01", "krd") + (("convexity",) if with_convexity else ())
+            want = set(legacy)
+        else:
+            want = set(outputs)
+            unknown = want - set(cls.OUTPUTS)
+            if unknown:
+                raise ValueError(f"Unknown outputs {sorted(unknown)}; expected a subset of {cls.OUTPUTS}")
+
+        portfolio = as_portfolio(bonds)
         ao = pd.to_datetime(as_of_date)
-        n = len(bonds)
-        max_cf = max(len(b.dates) for b in bonds)
-
-        # Initialize mats
-        flows_mat = np.zeros((n, max_cf), dtype=float)
-        ttm_mat   = np.zeros((n, max_cf), dtype=float)
-
-        # To collect accrued interest
-        accrued_arr = np.zeros(n, dtype=float)
-
-        # Build flows_mat, ttm_mat, and compute accrued for each bond
-        for i, b in enumerate(bonds):
-            # Time to each coupon date, in years
-            raw_ttm = (b.dates.astype('datetime64[D]') - ao.to_datetime64()) \
-                      / np.timedelta64(1, 'D') / 365.25
-
-            # Zero out any cashflows at or before valuation date (we'll zero those flows, and mark TTM=NaN)
-            ttm = np.where(raw_ttm <= 0.0, np.nan, raw_ttm)
-
-            # Fill first k positions in the mats
-            k = len(b.dates)
-            flows_mat[i, :k] = b.flows
-            ttm_mat[i, :k]   = ttm
-
-            # If ttm was NaN (coupon date ≤ as_of_date), remove that flow
-            flows_mat[i, :k] = np.where(np.isnan(ttm), 0.0, b.flows)
-
-            # ===== Accrued Interest Calculation =====
-            # 1) coupon amount per period
-            coupon_amt = b.face_value * b.coupon_rate / 100 / b.freq_per_year
-
-            # 2) find next coupon date strictly > as_of_date
-            future_coupons = [d for d in b.dates if d > ao]
-            if len(future_coupons) == 0:
-                # Already matured or no future coupon → no accrual
-                accrued_arr[i] = 0.0
-            else:
-                next_coupon = future_coupons[0]
-                # find its index to get previous coupon
-                idx_next = list(b.dates).index(next_coupon)
+        n = len(portfolio)
+
+        if max_memory_mb is not None and n:
+            max_cf = cls._chunk_cashflows(max_memory_mb, cls.SENSITIVITY_BYTES_PER_CF)
+            parts = [
+                cls.price_batch_with_sensitivities(chunk, ao, yield_curve, sensitivities,
+                                                   with_convexity, key_tenors, outputs=outputs)
+                for _, chunk in portfolio.iter_chunks(max_cf)
+            ]
+            if outputs is not None:
+                return {k: np.concatenate([part[k] for part in parts], axis=0) for k in parts[0]}
+            return tuple(np.concatenate(out, axis=0) for out in zip(*parts))
 
-                if idx_next == 0:
-                    # first coupon is still in future → last coupon is issue_date
-                    prev_coupon = b.issue_date
-                else:
-                    prev_coupon = b.dates[idx_next - 1]
+        res = {}
 
-                # accrual fraction between prev_coupon and next_coupon
-                accrual_days = (ao - prev_coupon).days
-                period_days  = (next_coupon - prev_coupon).days
-                accrual_frac = accrual_days / period_days if period_days > 0 else 0.0
+        # Flat layout of live cashflows only (no max_cf padding); per-bond sums are segment sums
+        bond_idx, flows, ttm, offsets = portfolio.cashflow_layout(ao)
 
-                # accrued interest = coupon_amt × fraction
-                accrued_arr[i] = coupon_amt * accrual_frac
+        # Accrued interest at as_of_date, whole portfolio at once
+        if want & {"accrued", "clean"}:
+            res["accrued"] = portfolio.accrual(ao)[0]
 
         # Get the base yields (in percent) for each flow TTM
-        rates_pct = yield_curve(ttm_mat)
-        # For any NaN-ttm, force rate = 0 so DF = 1
-        rates_pct = np.where(np.isnan(ttm_mat), 0.0, rates_pct)
+        rates_pct = yield_curve(ttm)
 
         # 1) Dirty price = sum(flows × exp(−r×ttm))
-        dfs_base = np.exp(-(rates_pct / 100) * np.nan_to_num(ttm_mat))
-        pvs_base = (flows_mat * dfs_base).sum(axis=1)
+        dfs_base = np.exp(-(rates_pct / 100) * ttm)
+        pvs_base = segment_sum(flows * dfs_base, offsets)
+        res["dirty"] = pvs_base
 
         # Clean price = Dirty price − Accrued
-        clean_prices = pvs_base - accrued_arr
+        if "clean" in want:
+            res["clean"] = pvs_base - res["accrued"]
+
+        if "krd" in want:
+            # Key-rate hat weights: two (key, weight) pairs per cashflow, independent of n_keys
+            key_tenors = cls.KEY_TENORS if key_tenors is None else list(key_tenors)
+            n_keys = len(key_tenors)
+            key_lo, key_hi, w_lo, w_hi = cls.make_krd_sparse_weights(ttm, key_tenors)
+
+        if sensitivities == "analytic":
+            if want & {"dv01", "krd", "convexity"}:
+                # −∂PV/∂r per cashflow (r in decimal), from the base discount factors
+                dur_w = flows * dfs_base * ttm
+
+            # 2) dv01 → parallel 1bp shift
+            if "dv01" in want:
+                res["dv01"] = segment_sum(dur_w, offsets) * 1e-4
+
+            # 3) key‐rate dv (krd): scatter each cashflow's two weighted pieces onto its keys
+            if "krd" in want:
+                rows = bond_idx * n_keys
+                res["krd"] = (
+                    np.bincount(rows + key_lo, dur_w * w_lo, minlength=n * n_keys)
+                    + np.bincount(rows + key_hi, dur_w * w_hi, minlength=n * n_keys)
+                ).reshape(n, n_keys) * 1e-4
+
+            if "convexity" in want:
+                res["convexity"] = segment_sum(dur_w * ttm, offsets) * 1e-8
+        else:
+            # 2) dv01 → parallel 1bp shift
+            if want & {"dv01", "convexity"}:
+                dfs_par = np.exp(-((rates_pct + 0.01) / 100) * ttm)
+                pvs_par = segment_sum(flows * dfs_par, offsets)
+                res["dv01"] = pvs_base - pvs_par
+
+            # 3) key‐rate dv (krd) for each tenor, now 1bp each
+            if "krd" in want:
+                krd_matrix = np.zeros((n, n_keys), dtype=float)
+                for idx in range(n_keys):
+                    # this is ±0.01 at max (i.e. 1bp)
+                    shock_pct = 0.01 * (np.where(key_lo == idx, w_lo, 0.0) + np.where(key_hi == idx, w_hi, 0.0))
+                    dfs_k = np.exp(-((rates_pct + shock_pct) / 100) * ttm)
+                    pvs_k = segment_sum(flows * dfs_k, offsets)
+                    krd_matrix[:, idx] = pvs_base - pvs_k
+                res["krd"] = krd_matrix
+
+            if "convexity" in want:
+                dfs_dn = np.exp(-((rates_pct - 0.01) / 100) * ttm)
+                pvs_dn = segment_sum(flows * dfs_dn, offsets)
+                res["convexity"] = pvs_par + pvs_dn - 2 * pvs_base
+
+        # Scale everything requested by quantity
+        qtys = portfolio.quantity
+        res = {k: res[k] * (qtys[:, None] if res[k].ndim == 2 else qtys) for k in cls.OUTPUTS if k in want}
+
+        if outputs is not None:
+            return res
+        return tuple(res[k] for k in legacy)
+
+    @classmethod
+    def price_batch_scenarios(cls, bonds, as_of_date, yield_curves, max_memory_mb=None):
+        """
+        Dirty prices of every bond under a stack of S curve scenarios.
 
-        # 2) dv01 → parallel 1bp shift
-        dfs_par = np.exp(-((rates_pct + 0.01) / 100) * np.nan_to_num(ttm_mat))
-        pvs_par = (flows_mat * dfs_par).sum(axis=1)
-        dv01    = pvs_base - pvs_par
+        The flat cashflow layout is built once and shared by all scenarios;
+        each curve is evaluated on the same TTM vector and the whole
+        (S × n_live_cf) block is discounted in one exp and segment sum.
 
-        # 3) key‐rate dv (krd) for each tenor, now 1bp each
-        key_tenors = [1,2,3,5,7,10,20,30]
-        shock_mats = cls.make_krd_shock_matrix(ttm_mat, key_tenors)
-        n_keys = len(key_tenors)
+        Args:
+          bonds        : BondPortfolio or list of Bond
+          as_of_date   : valuation date
+          yield_curves : sequence of S callables, TTM (years) → rate (percent),
+                         or a batch YieldCurve (evaluated with one sparse matmul)
+          max_memory_mb: optional working-set budget; bonds are streamed through
+                         in blocks sized so the (S × block) arrays fit in it
+
+        Returns:
+          pvs (S × n_bonds) dirty prices, scaled by quantity
+        """
+        portfolio = as_portfolio(bonds)
+        ao = pd.to_datetime(as_of_date)
+
+        if max_memory_mb is not None and len(portfolio):
+            bytes_per_cf = cls.SCENARIO_BYTES_PER_CF + 24 * len(yield_curves)
+            max_cf = cls._chunk_cashflows(max_memory_mb, bytes_per_cf)
+            return np.concatenate([
+                cls.price_batch_scenarios(chunk, ao, yield_curves)
+                for _, chunk in portfolio.iter_chunks(max_cf)
+            ], axis=1)
+
+        if isinstance(yield_curves, YieldCurve) and yield_curves.method == "linear":
+            return cls.price_batch_node_scenarios(portfolio, ao, yield_curves.tenors,
+                                                  np.atleast_2d(yield_curves.rates),
+                                                  yield_curves.extrapolation)
+
+        _, flows, ttm, offsets = portfolio.cashflow_layout(ao)
+
+        # (S, n_live_cf) rates
+        if isinstance(yield_curves, YieldCurve):
+            rates_pct = np.atleast_2d(yield_curves(ttm))
+        else:
+            rates_pct = np.stack([yc(ttm) for yc in yield_curves])
+
+        dfs = np.exp(-(rates_pct / 100) * ttm[np.newaxis])
+        pvs = segment_sum(flows[np.newaxis] * dfs, offsets)
+
+        return pvs * portfolio.quantity[np.newaxis, :]
+
+    @classmethod
+    def price_batch_node_scenarios(cls, bonds, as_of_date, tenors, node_rates,
+                                   extrapolation="linear"):
+        """
+        Dirty prices under S curves given directly as node rates on a shared
+        tenor grid.
+
+        The portfolio's sparse interpolation operator W (n_live_cf × n_tenors)
+        is built once per date, so all S curves are evaluated with one sparse
+        matmul W @ node_ratesᵀ, then discounted in one exp and segment sum.
+
+        Args:
+          bonds         : BondPortfolio or list of Bond
+          as_of_date    : valuation date
+          tenors        : (n_tenors,) node tenors in years
+          node_rates    : (S × n_tenors) or (n_tenors,) node rates in percent
+          extrapolation : "linear" (as get_yield_curve) or "flat" (as np.interp)
+
+        Returns:
+          pvs (S × n_bonds), or (n_bonds,) for a single curve, scaled by quantity
+        """
+        portfolio = as_portfolio(bonds)
+        ao = pd.to_datetime(as_of_date)
+        _, flows, ttm, offsets = portfolio.cashflow_layout(ao)
+        W = portfolio.interpolation_operator(ao, tenors, extrapolation)
+
+        node_rates = np.asarray(node_rates, dtype=float)
+        rates_pct = (W @ node_rates.T).T
+
+        dfs = np.exp(-(rates_pct / 100) * ttm)
+        pvs = segment_sum(flows * dfs, offsets)
+        return pvs * portfolio.quantity
+
+    @classmethod
+    def price_multi_date(cls, bonds, as_of_dates, yield_curves, quantities=None,
+                         max_memory_mb=None):
+        """
+        Price one security universe on D as-of dates in a single vectorized pass.
+
+        All schedules are laid out once as a (D × n_cf) time-to-cashflow grid
+        (date × bond × cashflow, flattened over bonds); flows on or before each
+        date are masked out, every row is discounted on that date's curve, and
+        per-bond values come from one segment sum.  Bonds that have matured on
+        a date price to 0; which bonds are actually held on each date is
+        expressed through `quantities`.
+
+        Args:
+          bonds         : BondPortfolio or list of Bond (the union over all dates)
+          as_of_dates   : D valuation dates
+          yield_curves  : D callables (one per date), TTM (years) → rate (percent)
+          quantities    : optional (D × n_bonds) positions; default portfolio.quantity on every date
+          max_memory_mb : optional working-set budget; bonds are streamed in blocks
+
+        Returns:
+          pvs_dirty  (D × n_bonds),
+          accrued    (D × n_bonds),
+          pvs_clean  (D × n_bonds), all scaled by quantity
+        """
+        portfolio = as_portfolio(bonds)
+        aos = pd.DatetimeIndex(pd.to_datetime(as_of_dates))
+        if len(yield_curves) != len(aos):
+            raise ValueError("Need exactly one yield curve per as-of date")
+        qtys = (np.broadcast_to(portfolio.quantity, (len(aos), len(portfolio)))
+                if quantities is None else np.asarray(quantities, dtype=float))
+
+        if max_memory_mb is not None and len(portfolio):
+            max_cf = cls._chunk_cashflows(max_memory_mb, cls.SCENARIO_BYTES_PER_CF + 24 * len(aos))
+            parts = [
+                cls.price_multi_date(chunk, aos, yield_curves, qtys[:, start:start + len(chunk)])
+                for start, chunk in portfolio.iter_chunks(max_cf)
+            ]
+            return tuple(np.concatenate(out, axis=1) for out in zip(*parts))
+
+        # Flows paid on or before the earliest date are never live: drop them up front
+        keep = portfolio.cf_dates > aos.min().to_datetime64()
+        cf_dates, cf_amounts = portfolio.cf_dates[keep], portfolio.cf_amounts[keep]
+        counts = np.bincount(portfolio.cf_bond_index[keep], minlength=len(portfolio))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        # (D, n_cf) years from each date to each cashflow; only strictly-future flows count
+        ttm = (cf_dates[np.newaxis, :] - aos.to_numpy()[:, np.newaxis]) \
+              / np.timedelta64(1, 'D') / 365.25
+        live = ttm > 0.0
+        ttm = np.where(live, ttm, 0.0)
+
+        # One curve per date row
+        rates_pct = np.stack([yc(ttm[d]) for d, yc in enumerate(yield_curves)])
+        dfs = np.exp(-(rates_pct / 100) * ttm)
+        pvs = segment_sum(np.where(live, cf_amounts[np.newaxis, :] * dfs, 0.0), offsets)
+
+        accrued = portfolio.accrual(aos)[0]
+        clean = pvs - accrued
+
+        return pvs * qtys, accrued * qtys, clean * qtys
 
-        krd_matrix = np.zeros((n, n_keys), dtype=float)
-        for idx in range(n_keys):
-            shock_pct = shock_mats[idx]  # this is ±0.01 at max (i.e. 1bp)
-            dfs_k = np.exp(-((rates_pct + shock_pct) / 100) * np.nan_to_num(ttm_mat))
-            pvs_k = (flows_mat * dfs_k).sum(axis=1)
-            krd_matrix[:, idx] = pvs_base - pvs_k
-
-        qtys = np.array([b.quantity for b in bonds])
-
-        pvs_base        *= qtys
-        accrued_arr     *= qtys
-        clean_prices    *= qtys
-        dv01            *= qtys
-        krd_matrix      *= qtys[:, None]  # broadcast to (n_bonds, n_keys)
-        
-        return pvs_base, accrued_arr, clean_prices, dv01, krd_matrix
@@ -0,0 +1,439 @@
+import pandas as pd
+import numpy as np
+
+from models.curves.interpolation import linear_interpolation_operator
+from models.pricing_models.schedule import coupon_schedules
+
+
+class BondPortfolio:
+    """
+    Columnar (struct-of-arrays) container for a book of bonds.
+
+    Per-bond fields are 1-D arrays of length n_bonds.  Cashflows are stored
+    flat, CSR-style: the flows of bond i live in
+    cf_dates[cf_offsets[i]:cf_offsets[i+1]] / cf_amounts[...].
+
+      • cusip          (n,)     object
+      • issue_date     (n,)     datetime64[D]
+      • maturity_date  (n,)     datetime64[D]
+      • coupon_rate    (n,)     float, percent (NaN coupons → 0.0)
+      • freq_per_year  (n,)     int, 2 for 'Semi-Annual' else 1
+      • quantity       (n,)     float
+      • face_value     (n,)     float
+      • cf_dates       (n_cf,)  datetime64[D]
+      • cf_amounts     (n_cf,)  float, coupons plus redemption on the last flow
+      • cf_offsets     (n+1,)   int64
+    """
+
+    def __init__(self, cusip, issue_date, maturity_date, coupon_rate, freq_per_year,
+                 quantity, face_value, cf_dates, cf_amounts, cf_offsets):
+        self.cusip         = np.asarray(cusip, dtype=object)
+        self.issue_date    = np.asarray(issue_date, dtype='datetime64[D]')
+        self.maturity_date = np.asarray(maturity_date, dtype='datetime64[D]')
+        self.coupon_rate   = np.asarray(coupon_rate, dtype=float)
+        self.freq_per_year = np.asarray(freq_per_year, dtype=np.int64)
+        self.quantity      = np.asarray(quantity, dtype=float)
+        self.face_value    = np.asarray(face_value, dtype=float)
+        self.cf_dates      = np.asarray(cf_dates, dtype='datetime64[D]')
+        self.cf_amounts    = np.asarray(cf_amounts, dtype=float)
+        self.cf_offsets    = np.asarray(cf_offsets, dtype=np.int64)
+        self._df_cache     = None
+        self._interp_cache = None
+
+    def __len__(self):
+        return len(self.cusip)
+
+    def __getitem__(self, key):
+        """Sub-portfolio by slice, integer index array or boolean mask."""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                # contiguous bonds → contiguous cashflows: views, no copy
+                lo, hi = self.cf_offsets[start], self.cf_offsets[max(stop, start)]
+                return BondPortfolio(
+                    cusip=self.cusip[start:stop],
+                    issue_date=self.issue_date[start:stop],
+                    maturity_date=self.maturity_date[start:stop],
+                    coupon_rate=self.coupon_rate[start:stop],
+                    freq_per_year=self.freq_per_year[start:stop],
+                    quantity=self.quantity[start:stop],
+                    face_value=self.face_value[start:stop],
+                    cf_dates=self.cf_dates[lo:hi],
+                    cf_amounts=self.cf_amounts[lo:hi],
+                    cf_offsets=self.cf_offsets[start:max(stop, start) + 1] - lo,
+                )
+            return self.take(np.arange(start, stop, step))
+        return self.take(key)
+
+    def take(self, idx):
+        """Sub-portfolio of the bonds at `idx` (integer indices or boolean mask), in that order."""
+        idx = np.asarray(idx)
+        if idx.dtype == bool:
+            idx = np.flatnonzero(idx)
+        counts = self.cf_counts[idx]
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        src = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - self.cf_offsets[idx], counts)
+        return BondPortfolio(
+            cusip=self.cusip[idx],
+            issue_date=self.issue_date[idx],
+            maturity_date=self.maturity_date[idx],
+            coupon_rate=self.coupon_rate[idx],
+            freq_per_year=self.freq_per_year[idx],
+            quantity=self.quantity[idx],
+            face_value=self.face_value[idx],
+            cf_dates=self.cf_dates[src],
+            cf_amounts=self.cf_amounts[src],
+            cf_offsets=offsets,
+        )
+
+    def iter_chunks(self, max_cashflows):
+        """
+        Yield (start, sub_portfolio) blocks of consecutive bonds holding at
+        most `max_cashflows` cashflows each (a single larger bond still gets
+        its own block).
+        """
+        n = len(self)
+        start = 0
+        while start < n:
+            limit = self.cf_offsets[start] + max_cashflows
+            stop = int(np.searchsorted(self.cf_offsets, limit, side='right')) - 1
+            stop = min(max(stop, start + 1), n)
+            yield start, self[start:stop]
+            start = stop
+
+    @property
+    def cf_counts(self):
+        """Number of cashflows per bond, shape (n_bonds,)."""
+        return np.diff(self.cf_offsets)
+
+    @property
+    def cf_bond_index(self):
+        """Owning bond index of every flat cashflow, shape (n_cf,)."""
+        return np.repeat(np.arange(len(self)), self.cf_counts)
+
+    @property
+    def coupon_amount(self):
+        """Coupon paid per period, per bond."""
+        return self.face_value * self.coupon_rate / 100 / self.freq_per_year
+
+    def cashflow_layout(self, as_of_date):
+        """
+        Flat (unpadded) layout of the cashflows still outstanding at as_of_date.
+
+        Flows on or before as_of_date are dropped, so a bill contributes one
+        entry and a matured bond none.  Live flows of each bond stay
+        contiguous, giving a CSR layout over the live flows.
+
+        Returns:
+          bond_idx  (m,)   owning bond of each live flow
+          flows     (m,)   cashflow amounts
+          ttm       (m,)   years from as_of_date to each flow (ACT/365.25), all > 0
+          offsets   (n+1,) CSR offsets of each bond's live flows
+        """
+        ao = pd.Timestamp(as_of_date)
+        ttm = (self.cf_dates - ao.to_datetime64()) / np.timedelta64(1, 'D') / 365.25
+        live = ttm > 0.0
+
+        bond_idx = self.cf_bond_index[live]
+        counts = np.bincount(bond_idx, minlength=len(self))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return bond_idx, self.cf_amounts[live], ttm[live], offsets
+
+    def interpolation_operator(self, as_of_date, tenors, extrapolation="linear"):
+        """
+        Sparse (n_live_cf × n_tenors) linear-interpolation operator from curve
+        nodes to this portfolio's live cashflow times at as_of_date.
+
+        Cashflow times and tenor nodes are fixed within a date, so the operator
+        is built once and kept on the portfolio; any curve or stack of curves
+        then evaluates as W @ node_rates.
+        """
+        key = (pd.Timestamp(as_of_date), tuple(np.asarray(tenors, dtype=float)), extrapolation)
+        if self._interp_cache is None or self._interp_cache[0] != key:
+            ttm = self.cashflow_layout(key[0])[2]
+            self._interp_cache = (key, linear_interpolation_operator(tenors, ttm, extrapolation))
+        return self._interp_cache[1]
+
+    def discount_cache(self, as_of_date, yield_curve):
+        """
+        DiscountFactorCache of this portfolio on (as_of_date, yield_curve).
+
+        The most recent cache is kept on the portfolio, so repeated scenario
+        requests against the same base curve reuse the same discount factors.
+        """
+        ao = pd.Timestamp(as_of_date)
+        cache = self._df_cache
+        if cache is None or cache.as_of_date != ao or cache.yield_curve is not yield_curve:
+            cache = DiscountFactorCache(self, ao, yield_curve)
+            self._df_cache = cache
+        return cache
+
+    def accrual(self, as_of_date):
+        """
+        Coupon accrual state of every bond at as_of_date, for the whole
+        portfolio at once.  as_of_date may also be a 1-D array of D dates,
+        in which case every output gains a leading date axis (D, n).
+
+        The next coupon of each bond is located with one searchsorted over
+        the flattened schedules (each bond's dates are shifted into their own
+        band so the flat array is globally sorted).  Before the first coupon
+        the previous coupon date is the issue date.
+
+        Returns:
+          accrued      (n,) accrued interest per bond (unit position, not scaled by quantity)
+          prev_coupon  (n,) datetime64[D], NaT when no coupon remains
+          next_coupon  (n,) datetime64[D], NaT when no coupon remains
+          accrual_frac (n,) fraction of the current coupon period elapsed
+        """
+        n = len(self)
+        scalar = np.ndim(as_of_date) == 0
+        ao_day = (pd.DatetimeIndex(np.atleast_1d(as_of_date)).normalize()
+                  .to_numpy().astype('datetime64[D]')[:, np.newaxis])          # (D, 1)
+        offsets = self.cf_offsets
+        nat = np.datetime64('NaT', 'D')
+        shape = (len(ao_day), n)
+
+        if len(self.cf_dates) == 0:
+            out = np.zeros(shape), np.full(shape, nat), np.full(shape, nat), np.zeros(shape)
+        else:
+            days = self.cf_dates.astype(np.int64)
+            lo = days.min()
+            span = days.max() - lo + 2
+            banded = self.cf_bond_index * span + (days - lo)
+            rel = np.clip(ao_day.astype(np.int64) - lo, -1, span - 1)
+
+            # first flow strictly after as_of_date within each bond's band
+            idx_next = np.searchsorted(banded, np.arange(n) * span + rel, side='right')
+            has_next = idx_next < offsets[1:]
+            idx_next = np.minimum(idx_next, len(days) - 1)
+
+            next_coupon = np.where(has_next, self.cf_dates[idx_next], nat)
+            prev_coupon = np.where(
+                idx_next > offsets[:-1],
+                self.cf_dates[np.maximum(idx_next - 1, 0)],
+                self.issue_date,
+            )
+            prev_coupon = np.where(has_next, prev_coupon, nat)
+
+            accrual_days = (ao_day - prev_coupon) / np.timedelta64(1, 'D')
+            period_days  = (next_coupon - prev_coupon) / np.timedelta64(1, 'D')
+            accrual_frac = np.zeros(shape, dtype=float)
+            ok = has_next & (period_days > 0)
+            accrual_frac[ok] = accrual_days[ok] / period_days[ok]
+
+            accrued = self.coupon_amount * accrual_frac
+            out = accrued, prev_coupon, next_coupon, accrual_frac
+
+        if scalar:
+            return tuple(x[0] for x in out)
+        return out
+
+    @classmethod
+    def from_inventory(cls, inv, face_value=100):
+        """
+        Build a portfolio from a `tsy_inventory` frame with columns
+        cusip, int_rate, issue_date, maturity_date, quantity, int_payment_frequency.
+        """
+        n = len(inv)
+        issue = pd.to_datetime(inv['issue_date']).to_numpy().astype('datetime64[D]')
+        maturity = pd.to_datetime(inv['maturity_date']).to_numpy().astype('datetime64[D]')
+        coupon = inv['int_rate'].to_numpy(dtype=float, na_value=np.nan)
+        coupon = np.where(np.isnan(coupon), 0.0, coupon)
+        freq = np.where(inv['int_payment_frequency'].to_numpy() == 'Semi-Annual', 2, 1)
+        face = np.full(n, float(face_value))
+
+        # Schedules depend only on (issue, maturity, frequency) and are memoized on that key
+        cf_dates, cf_offsets = coupon_schedules(issue, maturity, freq)
+        counts = np.diff(cf_offsets)
+
+        # Cashflow amounts: a coupon on every date, redemption added to the last one
+        coupon_amt = face * coupon / 100 / freq
+        cf_amounts = np.repeat(coupon_amt, counts)
+        cf_amounts[cf_offsets[1:][counts > 0] - 1] += face[counts > 0]
+
+        return cls(
+            cusip=inv['cusip'].to_numpy(),
+            issue_date=issue,
+            maturity_date=maturity,
+            coupon_rate=coupon,
+            freq_per_year=freq,
+            quantity=inv['quantity'].to_numpy(dtype=float),
+            face_value=face,
+            cf_dates=cf_dates,
+            cf_amounts=cf_amounts,
+            cf_offsets=cf_offsets,
+        )
+
+    @classmethod
+    def concat(cls, portfolios):
+        """Stack several portfolios into one, in order."""
+        portfolios = list(portfolios)
+        cf_offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for p in portfolios:
+            cf_offsets.append(p.cf_offsets[1:] + base)
+            base += p.cf_offsets[-1]
+        return cls(
+            cusip=np.concatenate([p.cusip for p in portfolios]),
+            issue_date=np.concatenate([p.issue_date for p in portfolios]),
+            maturity_date=np.concatenate([p.maturity_date for p in portfolios]),
+            coupon_rate=np.concatenate([p.coupon_rate for p in portfolios]),
+            freq_per_year=np.concatenate([p.freq_per_year for p in portfolios]),
+            quantity=np.concatenate([p.quantity for p in portfolios]),
+            face_value=np.concatenate([p.face_value for p in portfolios]),
+            cf_dates=np.concatenate([p.cf_dates for p in portfolios]),
+            cf_amounts=np.concatenate([p.cf_amounts for p in portfolios]),
+            cf_offsets=np.concatenate(cf_offsets),
+        )
+
+    def roll_forward(self, as_of_date):
+        """
+        Drop cashflows that can no longer affect pricing at or after as_of_date.
+
+        Flows paid on or before as_of_date are removed, except each bond's
+        most recent one, which anchors the accrual period.  Bonds are kept
+        (a matured bond simply has no future flows).
+        """
+        ao = pd.Timestamp(as_of_date).to_datetime64()
+        paid = self.cf_dates <= ao
+        n_paid = np.bincount(self.cf_bond_index[paid], minlength=len(self))
+
+        # position of each flow within its bond; schedules are sorted, so paid flows come first
+        pos = np.arange(len(self.cf_dates)) - np.repeat(self.cf_offsets[:-1], self.cf_counts)
+        keep = pos >= np.repeat(n_paid - 1, self.cf_counts)
+        if keep.all():
+            return self
+
+        counts = np.bincount(self.cf_bond_index[keep], minlength=len(self))
+        return BondPortfolio(
+            cusip=self.cusip,
+            issue_date=self.issue_date,
+            maturity_date=self.maturity_date,
+            coupon_rate=self.coupon_rate,
+            freq_per_year=self.freq_per_year,
+            quantity=self.quantity,
+            face_value=self.face_value,
+            cf_dates=self.cf_dates[keep],
+            cf_amounts=self.cf_amounts[keep],
+            cf_offsets=np.concatenate([[0], np.cumsum(counts)]),
+        )
+
+    @classmethod
+    def from_bonds(cls, bonds):
+        """Build a portfolio from a list of Bond objects."""
+        counts = np.array([len(b.dates) for b in bonds], dtype=np.int64)
+        return cls(
+            cusip=[b.cusip for b in bonds],
+            issue_date=[b.issue_date.to_datetime64() for b in bonds],
+            maturity_date=[b.maturity_date.to_datetime64() for b in bonds],
+            coupon_rate=[b.coupon_rate for b in bonds],
+            freq_per_year=[b.freq_per_year for b in bonds],
+            quantity=[b.quantity for b in bonds],
+            face_value=[b.face_value for b in bonds],
+            cf_dates=np.concatenate([b.dates.astype('datetime64[D]') for b in bonds]),
+            cf_amounts=np.concatenate([b.flows for b in bonds]),
+            cf_offsets=np.concatenate([[0], np.cumsum(counts)]),
+        )
+
+
+class DiscountFactorCache:
+    """
+    Base discount factors of a portfolio's live cashflows on one curve, with
+    scenario repricing as elementwise rescaling.
+
+    Under continuous compounding a rate shift s(t) (percent) multiplies every
+    base discount factor by exp(−s(t)/100 · t), so a shocked price is
+
+        PV = Σ CF·DF_base · exp(−s(t)/100 · t)
+
+    with no re-interpolation of the curve and no recomputation of the base
+    exp.  All scenario methods accept a scalar or a 1-D array of S shifts and
+    return (n_bonds,) or (S × n_bonds) dirty prices scaled by quantity.
+
+    Note: a PCA shift is applied on top of the full base curve (loading
+    interpolated flat between tenors), not by re-linearizing the base curve
+    on the PCA tenor grid.
+    """
+
+    def __init__(self, portfolio, as_of_date, yield_curve):
+        self.portfolio = portfolio
+        self.as_of_date = pd.Timestamp(as_of_date)
+        self.yield_curve = yield_curve
+
+        self.bond_idx, self.flows, self.ttm, self.offsets = portfolio.cashflow_layout(self.as_of_date)
+        self.rates_pct = yield_curve(self.ttm)
+        self.dfs = np.exp(-(self.rates_pct / 100) * self.ttm)
+        self.pv_flows = self.flows * self.dfs
+
+    @property
+    def base_pvs(self):
+        """Dirty prices on the base curve, scaled by quantity."""
+        return segment_sum(self.pv_flows, self.offsets) * self.portfolio.quantity
+
+    def price_shift(self, shift_pct):
+        """
+        Dirty prices under an additive rate shift given per live cashflow:
+        shift_pct of shape (m,) or (S, m), in percent.
+        """
+        scale = np.exp(-(np.asarray(shift_pct, dtype=float) / 100) * self.ttm)
+        return segment_sum(self.pv_flows * scale, self.offsets) * self.portfolio.quantity
+
+    def _price_profile(self, profile, shift_bp):
+        """Price shifts of shape shift_bp × profile(t) (profile per live cashflow)."""
+        shift_bp = np.asarray(shift_bp, dtype=float)
+        shift_pct = np.multiply.outer(shift_bp / 100, profile)
+        return self.price_shift(shift_pct)
+
+    def parallel(self, shift_bp):
+        """Parallel shift(s) in bp."""
+        return self._price_profile(np.ones_like(self.ttm), shift_bp)
+
+    def pca(self, tenors, loading, shift_bp):
+        """PCA bump(s): rates move by loading(t) × shift_bp, loading flat beyond the tenor grid."""
+        tenors = np.asarray(tenors, dtype=float)
+        loading = np.asarray(loading, dtype=float)
+        profile = np.interp(self.ttm, tenors, loading, left=loading[0], right=loading[-1])
+        return self._price_profile(profile, shift_bp)
+
+    def twist(self, shift_bp, short_tenor=2.0, long_tenor=10.0):
+        """
+        Steepener twist(s): −shift_bp/2 at and below short_tenor, +shift_bp/2
+        at and beyond long_tenor, linear in between (negative shift_bp flattens).
+        """
+        profile = np.interp(self.ttm, [short_tenor, long_tenor], [-0.5, 0.5])
+        return self._price_profile(profile, shift_bp)
+
+    def key_rate(self, key, shift_bp, key_tenors=None):
+        """Key-rate shift(s) of shift_bp at key tenor `key` (hat weights as in the KRDs)."""
+        from models.pricing_models.bond_model import Bond
+
+        key_tenors = Bond.KEY_TENORS if key_tenors is None else list(key_tenors)
+        k = key_tenors.index(key)
+        key_lo, key_hi, w_lo, w_hi = Bond.make_krd_sparse_weights(self.ttm, key_tenors)
+        profile = np.where(key_lo == k, w_lo, 0.0) + np.where(key_hi == k, w_hi, 0.0)
+        return self._price_profile(profile, shift_bp)
+
+
+def as_portfolio(bonds):
+    """Return `bonds` as a BondPortfolio, converting a list of Bond if needed."""
+    if isinstance(bonds, BondPortfolio):
+        return bonds
+    return BondPortfolio.from_bonds(bonds)
+
+
+def segment_sum(values, offsets):
+    """
+    Sum `values` over CSR segments along the last axis.
+
+    values  : (..., m)
+    offsets : (n+1,) segment boundaries into the last axis
+    Returns (..., n); empty segments sum to 0.
+    """
+    n = len(offsets) - 1
+    out = np.zeros(values.shape[:-1] + (n,), dtype=float)
+    nonempty = offsets[:-1] < offsets[1:]
+    if nonempty.any():
+        # consecutive non-empty starts are exactly the segment boundaries
+        out[..., nonempty] = np.add.reduceat(values, offsets[:-1][nonempty], axis=-1)
+    return out
+
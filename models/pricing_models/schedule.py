@@ -0,0 +1,113 @@
+import numpy as np
+
+# (issue day, maturity day, freq_per_year) → read-only datetime64[D] coupon dates
+_schedule_cache = {}
+
+
+def _days_in_month(months):
+    """Number of days in each datetime64[M] month."""
+    return ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+
+
+def _build_schedules(issue, maturity, freq_per_year):
+    """
+    Vectorized coupon schedules for arrays of bonds (no caching).
+
+    Coupon k (k = 1, 2, ...) falls `k × 12/freq` calendar months after the
+    issue date, on the issue day-of-month clipped to the length of the
+    target month.  An issue date on the last day of its month keeps every
+    coupon on the last day of the month.  Dates are generated until the
+    first one on or after maturity.  This matches the original Bond
+    schedule's cumulative DateOffset stepping only for issue days ≤ 28;
+    later days no longer drift down after passing a short month.
+
+    Returns:
+      cf_dates   (n_cf,)  datetime64[D], flattened schedules
+      cf_offsets (n+1,)   int64, CSR offsets into cf_dates
+    """
+    issue = np.asarray(issue, dtype='datetime64[D]')
+    maturity = np.asarray(maturity, dtype='datetime64[D]')
+    step = 12 // np.asarray(freq_per_year, dtype=np.int64)
+
+    issue_m = issue.astype('datetime64[M]')
+    issue_day = (issue - issue_m.astype('datetime64[D]')).astype(np.int64) + 1
+    issue_eom = issue_day == _days_in_month(issue_m)
+
+    def nth_coupon(k, months, day, eom, step):
+        target_m = months + k * step
+        dim = _days_in_month(target_m)
+        d = np.where(eom, dim, np.minimum(day, dim))
+        return target_m.astype('datetime64[D]') + (d - 1)
+
+    # Number of coupons: smallest k ≥ 1 with coupon_k ≥ maturity
+    diff_m = (maturity.astype('datetime64[M]') - issue_m).astype(np.int64)
+    q, r = np.divmod(np.maximum(diff_m, 0), step)
+    on_or_after = nth_coupon(q, issue_m, issue_day, issue_eom, step) >= maturity
+    counts = np.where((r == 0) & (q >= 1) & on_or_after, q, q + 1)
+    counts = np.where(issue < maturity, counts, 0)
+
+    cf_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    # Expand to one row per coupon and evaluate all dates at once
+    k = np.arange(cf_offsets[-1]) - np.repeat(cf_offsets[:-1], counts) + 1
+    cf_dates = nth_coupon(
+        k,
+        np.repeat(issue_m, counts),
+        np.repeat(issue_day, counts),
+        np.repeat(issue_eom, counts),
+        np.repeat(step, counts),
+    )
+    return cf_dates, cf_offsets
+
+
+def coupon_schedules(issue, maturity, freq_per_year):
+    """
+    Coupon schedules for arrays of bonds, memoized by (issue, maturity, frequency).
+
+    Only schedules not already cached are generated, in one vectorized call;
+    the result is gathered from the cache without a per-coupon Python loop.
+
+    Returns:
+      cf_dates   (n_cf,)  datetime64[D]
+      cf_offsets (n+1,)   int64
+    """
+    issue = np.asarray(issue, dtype='datetime64[D]').ravel()
+    maturity = np.asarray(maturity, dtype='datetime64[D]').ravel()
+    freq = np.broadcast_to(np.asarray(freq_per_year, dtype=np.int64), issue.shape)
+
+    triples = np.stack([issue.astype(np.int64), maturity.astype(np.int64), freq], axis=1)
+    uniq, codes = np.unique(triples, axis=0, return_inverse=True)
+    codes = codes.ravel()
+    keys = [tuple(row) for row in uniq.tolist()]
+
+    missing = [i for i, key in enumerate(keys) if key not in _schedule_cache]
+    if missing:
+        m = uniq[missing]
+        dates, offsets = _build_schedules(
+            m[:, 0].astype('datetime64[D]'), m[:, 1].astype('datetime64[D]'), m[:, 2]
+        )
+        dates.flags.writeable = False
+        for j, i in enumerate(missing):
+            _schedule_cache[keys[i]] = dates[offsets[j]:offsets[j + 1]]
+
+    # Flatten the distinct schedules, then gather one copy per bond
+    u_counts = np.array([len(_schedule_cache[key]) for key in keys], dtype=np.int64)
+    u_offsets = np.concatenate([[0], np.cumsum(u_counts)])
+    u_dates = (np.concatenate([_schedule_cache[key] for key in keys])
+               if keys else np.array([], dtype='datetime64[D]'))
+
+    counts = u_counts[codes]
+    cf_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    src = np.arange(cf_offsets[-1]) - np.repeat(cf_offsets[:-1] - u_offsets[codes], counts)
+    return u_dates[src], cf_offsets
+
+
+def coupon_schedule(issue, maturity, freq_per_year):
+    """Memoized coupon dates (datetime64[D]) for a single bond."""
+    dates, _ = coupon_schedules([issue], [maturity], [freq_per_year])
+    return dates
+
+
+def clear_schedule_cache():
+    """Drop all memoized schedules."""
+    _schedule_cache.clear()